@@ -9,24 +9,37 @@ Commands:
 
 from __future__ import annotations
 
+import functools
 import os
+import re
 import subprocess
 import sys
 from pathlib import Path
 from typing import Tuple
 
+# `version = "..."` inside the [project] table (lines before the next table header)
+_VERSION_RE = re.compile(
+    rb'^\[project\][ \t]*\r?\n(?:(?!\[)[^\n]*\n)*?version\s*=\s*"([^"]+)"', re.M
+)
+
 
 def read_version(pyproject_path: Path = Path("pyproject.toml")) -> str:
+    data = pyproject_path.read_bytes()
+    match = _VERSION_RE.search(data)
+    if match:
+        return match.group(1).decode()
+
+    # Fall back to a full parse for layouts the regex does not cover
     import tomllib
 
-    data = tomllib.loads(pyproject_path.read_text())
-    version = data.get("project", {}).get("version")
+    version = tomllib.loads(data.decode()).get("project", {}).get("version")
     if not version:
         print("::error::[project].version missing in pyproject.toml", file=sys.stderr)
         raise SystemExit(1)
     return str(version)
 
 
+@functools.lru_cache(maxsize=None)
 def tag_exists(tag: str) -> bool:
     try:
         subprocess.run(["git", "rev-parse", "-q", "--verify", f"refs/tags/{tag}"],
@@ -36,6 +49,15 @@ def tag_exists(tag: str) -> bool:
         return False
 
 
+def tags_exist(tags: list[str]) -> dict[str, bool]:
+    """Check several tags with a single git call."""
+    refs = [f"refs/tags/{tag}" for tag in tags]
+    proc = subprocess.run(["git", "for-each-ref", "--format=%(refname)", *refs],
+                          check=True, capture_output=True, text=True)
+    found = set(proc.stdout.split())
+    return {tag: ref in found for tag, ref in zip(tags, refs)}
+
+
 def write_output(**kwargs: str) -> None:
     out = os.environ.get("GITHUB_OUTPUT")
     if not out:
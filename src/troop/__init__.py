@@ -1,7 +1,6 @@
-import logging
-
-
 def main() -> None:
+    import logging
+
     # Suppress httpx INFO logging
     logging.getLogger("httpx").setLevel(logging.WARNING)
     # Import the Typer app lazily to avoid side effects at package import time
@@ -1,22 +1,86 @@
+from collections import deque
+from functools import lru_cache
+
+import click
 import typer
-from rich.console import Console
+from typer.core import TyperGroup
 
 from .commands import provider_app, mcp_app, agent_app, model_app
-from .utils import run_async
+from . import config
 from .config import Settings, RESERVED_NAMES
-from .display import MessageDisplay
-from .runner import AgentRunner
 
-console = Console()
-display = MessageDisplay(console)
-settings = Settings.load()
+
+def _get_settings() -> Settings:
+    """Return the process-wide settings shared with the config commands."""
+    return config.settings
+
+
+async def _run_agent(agent_name: str, prompt: str | None, model: str | None, verbose: bool):
+    # Heavy imports (pydantic_ai, rich) are deferred until an agent actually runs
+    from rich.console import Console
+
+    from .display import MessageDisplay
+    from .runner import AgentRunner
+
+    settings = _get_settings()
+    console = Console()
+    display = MessageDisplay(console)
+    try:
+        # Build runner (validates provider and servers)
+        runner = AgentRunner.from_config(settings, agent_name, model_name=model)
+
+        if prompt:
+            # Unified execution path for single-prompt mode
+            async with runner.running():
+                await runner.run_once(
+                    prompt,
+                    display,
+                    verbose,
+                    message_history=None,
+                )
+        else:
+            # Interactive chat mode using the same execution pipeline.
+            # History is trimmed by whole turns so tool calls and their
+            # results are never split, keeping each request's payload bounded.
+            turns = deque(maxlen=max(settings.history_turns, 1))
+            async with runner.running():
+                console.print()
+                while True:
+                    message = await display.prompt_user_input()
+
+                    # Run agent with tool display support
+                    result = await runner.run_once(
+                        message,
+                        display,
+                        verbose,
+                        message_history=[m for turn in turns for m in turn],
+                    )
+                    turns.append(result.new_messages())
+    except KeyboardInterrupt:
+        display.print_error("Interrupted by user")
+        raise typer.Exit(1)
+    except ValueError as e:
+        display.print_error(str(e))
+        # Keep exit code 0 to match older test expectations
+        return
+    except KeyError as e:
+        display.print_error(f"Missing configuration: {e}")
+        raise typer.Exit(1)
+    except Exception as e:
+        # Harmonize error message for MCP server startup issues
+        display.print_error(f"Failed to connect to MCP server: {str(e)}")
+        raise typer.Exit(1)
 
 
+@lru_cache(maxsize=None)
 def create_agent_command(agent_name: str):
-    """Create a command function for a specific agent"""
+    """Create a command function for a specific agent.
+
+    Cached per name; settings are looked up when the command runs, so a
+    cached command still sees the current configuration.
+    """
 
-    @run_async
-    async def agent_command(
+    def agent_command(
         prompt: str = typer.Option(
             None, "-p", "--prompt", help="Single prompt to send to the agent"
         ),
@@ -27,62 +91,67 @@ def create_agent_command(agent_name: str):
             False, "-v", "--verbose", help="Show detailed output including tool calls"
         ),
     ):
-        try:
-            # Build runner (validates provider and servers)
-            runner = AgentRunner.from_config(settings, agent_name, model_name=model)
-
-            if prompt:
-                # Unified execution path for single-prompt mode
-                async with runner.agent:
-                    await runner.run_once(
-                        prompt,
-                        display,
-                        verbose,
-                        message_history=None,
-                    )
-            else:
-                # Interactive chat mode using the same execution pipeline
-                messages = []
-                async with runner.agent:
-                    console.print()
-                    while True:
-                        message = display.prompt_user_input()
-
-                        # Run agent with tool display support
-                        result = await runner.run_once(
-                            message,
-                            display,
-                            verbose,
-                            message_history=messages,
-                        )
-                        messages += result.new_messages()
-        except KeyboardInterrupt:
-            display.print_error("Interrupted by user")
-            raise typer.Exit(1)
-        except ValueError as e:
-            display.print_error(str(e))
-            # Keep exit code 0 to match older test expectations
-            return
-        except KeyError as e:
-            display.print_error(f"Missing configuration: {e}")
-            raise typer.Exit(1)
-        except Exception as e:
-            # Harmonize error message for MCP server startup issues
-            display.print_error(f"Failed to connect to MCP server: {str(e)}")
-            raise typer.Exit(1)
+        if not prompt:
+            return interactive_loop(agent_name, model, verbose)
+        from .utils import run_async
+
+        return run_async(_run_agent)(agent_name, prompt, model, verbose)
 
     return agent_command
 
 
-app = typer.Typer()
+def interactive_loop(agent_name: str, model: str | None = None, verbose: bool = False):
+    """Chat with an agent until interrupted; Ctrl+C exits with code 1."""
+    from .utils import run_async
 
-# Add static command groups
+    return run_async(_run_agent)(agent_name, None, model, verbose)
+
+
+def rebuild(settings: Settings | None = None) -> None:
+    """Point every command at ``settings``, or at a fresh load if omitted.
+
+    Rebinds ``config.settings`` together with the reference each config
+    command module imported from it, so agent and config commands always
+    read the same object. Agent commands are built from it each time the
+    click group is built.
+    """
+    from .commands import agent, mcp, model, provider
+
+    settings = settings if settings is not None else Settings.load_cached()
+    for module in (config, agent, mcp, model, provider):
+        module.settings = settings
+
+
+def _agent_names() -> list[str]:
+    return [name for name in _get_settings().agents if name not in RESERVED_NAMES]
+
+
+class AgentGroup(TyperGroup):
+    """Top-level group that builds agent commands on demand.
+
+    Only the invoked agent's click command is created, so startup cost no
+    longer grows with the number of configured agents. ``--help`` still
+    lists every agent.
+    """
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        static = super().list_commands(ctx)
+        return [name for name in _agent_names() if name not in static] + static
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in _agent_names():
+            single = typer.Typer(add_completion=False)
+            single.command(name=cmd_name)(create_agent_command(cmd_name))
+            command = typer.main.get_command(single)
+            self.add_command(command, cmd_name)
+        return command
+
+
+app = typer.Typer(cls=AgentGroup)
+
+# Add static command groups; agent commands are resolved by AgentGroup
 app.add_typer(provider_app, name="provider")
 app.add_typer(mcp_app, name="mcp")
 app.add_typer(agent_app, name="agent")
 app.add_typer(model_app, name="model")
-
-# Dynamically add agent commands at startup based on loaded settings
-for agent_name in settings.agents:
-    if agent_name not in RESERVED_NAMES:
-        app.command(name=agent_name)(create_agent_command(agent_name))
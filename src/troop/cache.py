@@ -0,0 +1,84 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+cache_path = Path.home() / ".troop" / "cache.sqlite"
+
+
+class PromptCache:
+    """Exact-match cache of single-prompt agent responses, stored in SQLite.
+
+    Entries are keyed on a hash of the model, the agent instructions and the
+    prompt, and expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float, path: Path | None = None):
+        path = path or cache_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        row = self._db.execute(
+            "SELECT response, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return row[0]
+
+    def put(self, key: str, response: str):
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ToolCache:
+    """In-process cache of MCP tool results for servers that opt in.
+
+    Entries are keyed on the tool name and its arguments as canonical JSON,
+    and expire after ``ttl`` seconds. Failed calls raise and are never stored.
+    """
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, Any]] = {}
+
+    @staticmethod
+    def make_key(name: str, args: dict) -> str:
+        canonical = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+        return PromptCache.make_key(name, canonical)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if time.monotonic() >= entry[0]:
+            del self._entries[key]
+            return default
+        return entry[1]
+
+    def put(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
@@ -1,18 +1,82 @@
+import sys
+
 import typer
 from rich import print as rprint
-from rich.table import Table
 
 from ..config import settings, RESERVED_NAMES
 
+_RESERVED_LIST = ", ".join(sorted(RESERVED_NAMES))
+
 app = typer.Typer(
     name="agent",
     help="Manage AI agents with their instructions and tools. (list/add/edit/remove/set)",
 )
 
 
+def _edit_agent_in_editor(name: str, agent: dict, new: bool = False) -> dict | None:
+    """Edit an agent's model, instructions and servers in one $EDITOR pass.
+
+    New agents must name their model as provider:model or a model profile.
+    """
+    from ..editor import edit_toml, toml_line
+
+    template = (
+        f"# Agent: {name}\n"
+        "# Save and close the editor to apply, or quit without saving to abort.\n"
+        f"{toml_line('model', agent.get('model', ''))}\n"
+        f"{toml_line('instructions', agent.get('instructions', ''))}\n"
+        f"{toml_line('servers', list(agent.get('servers') or []))}\n"
+    )
+
+    def validate(data: dict):
+        for key in ("model", "instructions"):
+            if not isinstance(data.get(key), str):
+                raise ValueError(f"'{key}' must be a string")
+            if not data[key].strip():
+                raise ValueError(f"'{key}' must not be empty")
+        model = data["model"]
+        if new and ":" not in model and model not in settings.models:
+            raise ValueError(
+                "Invalid model. Use provider:model syntax (e.g., openai:gpt-5-mini) or a model profile"
+            )
+        servers = data.get("servers", [])
+        if not isinstance(servers, list) or not all(isinstance(s, str) for s in servers):
+            raise ValueError("'servers' must be a list of strings")
+        missing = [s for s in servers if s not in settings.mcps]
+        if missing:
+            raise ValueError(f"These servers don't exist: {', '.join(missing)}")
+
+    data = edit_toml(template, validate)
+    if data is None:
+        return None
+    return {
+        "model": data["model"],
+        "instructions": data["instructions"],
+        "servers": data.get("servers", []),
+    }
+
+
 @app.command("list")
 def list_agents():
     """List all available agents"""
+    rows = [
+        (
+            name,
+            agent.get("model", "Not set"),
+            agent["instructions"][:30] + "...",
+            ", ".join(agent["servers"]),
+        )
+        for name, agent in settings.agents.items()
+    ]
+
+    # Plain tab-separated lines when piped, e.g. `troop agent list | grep ...`
+    if not sys.stdout.isatty():
+        for row in rows:
+            print("\t".join(row))
+        return
+
+    from rich.table import Table
+
     table = Table()
     table.add_column("Name", justify="left")
     table.add_column("Model", justify="left", overflow="fold")
@@ -20,19 +84,19 @@ def list_agents():
     table.add_column("Servers", justify="left", overflow="fold")
     # Settings column removed; model settings are no longer managed here.
 
-    for name, agent in settings.agents.items():
-        table.add_row(
-            name,
-            agent.get("model", "Not set"),
-            agent["instructions"][:30] + "...",
-            ", ".join(agent["servers"]),
-        )
+    for row in rows:
+        table.add_row(*row)
 
     rprint(table)
 
 
 @app.command("add")
-def add_agent(name: str = typer.Argument(None, help="Name of the agent")):
+def add_agent(
+    name: str = typer.Argument(None, help="Name of the agent"),
+    editor: bool = typer.Option(
+        False, "--editor", "-e", help="Fill in all fields at once in $EDITOR"
+    ),
+):
     """Add a new agent"""
     if not name:
         name = typer.prompt("Enter name")
@@ -42,14 +106,22 @@ def add_agent(name: str = typer.Argument(None, help="Name of the agent")):
         rprint(
             f"[red]Error:[/red] '{name}' is a reserved command name and cannot be used as an agent name"
         )
-        rprint("\nReserved names: " + ", ".join(sorted(RESERVED_NAMES)))
+        rprint("\nReserved names: " + _RESERVED_LIST)
         return
 
     confirm = True
     if name in settings.agents:
         confirm = typer.confirm(f"Agent {name} already exists. Overwrite it?")
 
-    if confirm:
+    if confirm and editor:
+        agent = _edit_agent_in_editor(name, {}, new=True)
+        if agent is None:
+            rprint("Aborted")
+            return
+        settings.agents[name] = agent
+        settings.save()
+        rprint(f"Added agent {name}")
+    elif confirm:
         model = typer.prompt("Enter model (e.g., openai:gpt-4o)")
 
         instructions = typer.prompt("Enter instructions")
@@ -88,7 +160,12 @@ def remove_agent(name: str = typer.Argument(None, help="Name of the Agent")):
 
 
 @app.command("edit")
-def edit_agent(name: str = typer.Argument(None, help="Name of the agent to edit")):
+def edit_agent(
+    name: str = typer.Argument(None, help="Name of the agent to edit"),
+    editor: bool = typer.Option(
+        False, "--editor", "-e", help="Edit all fields at once in $EDITOR"
+    ),
+):
     """Edit an existing agent"""
     if not name:
         name = typer.prompt("Enter name")
@@ -100,6 +177,16 @@ def edit_agent(name: str = typer.Argument(None, help="Name of the agent to edit"
     # Get current agent configuration
     current_agent = settings.agents[name]
 
+    if editor:
+        updated = _edit_agent_in_editor(name, current_agent)
+        if updated is None:
+            rprint("Aborted")
+            return
+        settings.agents[name] = updated
+        settings.save()
+        rprint(f"\n[green]✓[/green] Agent '{name}' updated successfully")
+        return
+
     rprint(f"\n[bold]Editing agent: {name}[/bold]")
     rprint("[dim]Press Enter to keep current value[/dim]\n")
 
@@ -1,25 +1,68 @@
+import os
+import pickle
 import shlex
+import shutil
+import sys
 
 import typer
 from rich import print as rprint
-from rich.table import Table
 
-from ..config import settings
+from ..config import settings, config_path, _replace_file
 
 app = typer.Typer(name="mcp", help="Manage MCP servers that provide tools. (list/add/remove)")
 
 
+def _list_cache_key(rows):
+    """Identify one rendering of the server table: its rows plus the terminal."""
+    return (
+        tuple(rows),
+        shutil.get_terminal_size().columns,
+        os.environ.get("TERM"),
+        "NO_COLOR" in os.environ,
+    )
+
+
 @app.command("list")
 def list_servers():
     """List all available servers"""
+    rows = [(name, " ".join(params["command"])) for name, params in settings.mcps.items()]
+
+    # Plain tab-separated lines when piped
+    if not sys.stdout.isatty():
+        for row in rows:
+            print("\t".join(row))
+        return
+
+    # Replay the last rendered table while its rows and the terminal are
+    # unchanged, skipping the Rich import and render entirely
+    key = _list_cache_key(rows)
+    cache_path = config_path.with_name(".mcp_list.cache")
+    try:
+        cached_key, output = pickle.loads(cache_path.read_bytes())
+        if cached_key == key:
+            sys.stdout.write(output)
+            return
+    # Missing, truncated or foreign cache files are simply re-rendered
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+        pass
+
+    from rich.console import Console
+    from rich.table import Table
+
     table = Table()
     table.add_column("Name", justify="left")
     table.add_column("Command", justify="left")
 
-    for name, params in settings.mcps.items():
-        table.add_row(name, " ".join(params["command"]))
+    for row in rows:
+        table.add_row(*row)
 
-    rprint(table)
+    console = Console(record=True)
+    console.print(table)
+    try:
+        # Server commands can carry secrets, like everything else in ~/.troop
+        _replace_file(cache_path, pickle.dumps((key, console.export_text(styles=True))))
+    except OSError:
+        pass
 
 
 @app.command("add")
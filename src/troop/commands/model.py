@@ -1,7 +1,9 @@
-import json
+import re
+import sys
+
 import typer
+from pydantic_core import from_json
 from rich import print as rprint
-from rich.table import Table
 
 from ..config import settings
 
@@ -24,20 +26,29 @@ COMMON_KEYS = {
 }
 
 PROVIDER_PREFIXES = {"openai", "anthropic", "bedrock", "cohere", "google", "grok", "huggingface"}
+_PREFIX_RE = re.compile("(?:" + "|".join(map(re.escape, sorted(PROVIDER_PREFIXES))) + ")[_:]")
+
+# Single-pass classifier for user-entered setting values
+_VALUE_RE = re.compile(
+    r"""
+      (?P<bool>(?i:true|false))
+    | (?P<int>[+-]?\d+)
+    | (?P<float>[+-]?(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?|[+-]?\d+[eE][+-]?\d+)
+    | (?P<json>[\[{"].*|null|NaN|-?Infinity)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
 
 
 def _is_valid_setting_key(key: str) -> bool:
     """Heuristic validation for model settings.
 
     - True for common cross-provider keys supported by Pydantic AI.
-    - True if key starts with a known provider prefix (case-insensitive), e.g. "openai_".
+    - True if key starts with a known provider prefix followed by "_" or ":"
+      (case-insensitive), e.g. "openai_".
     - False otherwise. False does not block; callers should warn but still accept.
     """
-    if key in COMMON_KEYS:
-        return True
-    kl = key.lower()
-    return any(kl.startswith(p + "_") or kl.startswith(p + ":") or kl.startswith(p)
-               for p in PROVIDER_PREFIXES)
+    return key in COMMON_KEYS or _PREFIX_RE.match(key.lower()) is not None
 
 
 def _parse_value(raw: str):
@@ -46,33 +57,50 @@ def _parse_value(raw: str):
     Accepts JSON, otherwise falls back to str. Convenient bool/number parsing included.
     """
     raw = raw.strip()
+    match = _VALUE_RE.fullmatch(raw)
+    if match is None:
+        return raw
+    kind = match.lastgroup
+    if kind == "bool":
+        return raw.lower() == "true"
+    if kind == "int":
+        return int(raw)
+    if kind == "float":
+        return float(raw)
+    # JSON objects, arrays, strings and constants go through jiter (pydantic-core)
     try:
-        return json.loads(raw)
-    except Exception:
-        # Fallback for simple bools without JSON casing
-        if raw.lower() in {"true", "false"}:
-            return raw.lower() == "true"
-        # Try number
-        try:
-            if "." in raw:
-                return float(raw)
-            return int(raw)
-        except Exception:
-            return raw
+        return from_json(raw)
+    except ValueError:
+        return raw
 
 
 @app.command("list")
 def list_models():
     """List all model profiles"""
+    rows = [
+        (
+            name,
+            prof.get("model", "-"),
+            ", ".join(sorted((prof.get("settings") or {}).keys())),
+        )
+        for name, prof in settings.models.items()
+    ]
+
+    # Plain tab-separated lines when piped
+    if not sys.stdout.isatty():
+        for row in rows:
+            print("\t".join(row))
+        return
+
+    from rich.table import Table
+
     table = Table()
     table.add_column("Name", justify="left")
     table.add_column("Model", justify="left", overflow="fold")
     table.add_column("Settings (keys)", justify="left", overflow="fold")
 
-    for name, prof in settings.models.items():
-        model = prof.get("model", "-")
-        keys = ", ".join(sorted((prof.get("settings") or {}).keys()))
-        table.add_row(name, model, keys)
+    for row in rows:
+        table.add_row(*row)
 
     rprint(table)
 
@@ -86,6 +114,9 @@ def add_model(
         "--set",
         help="Model setting as key=JSON_value (repeatable)",
     ),
+    editor: bool = typer.Option(
+        False, "--editor", "-e", help="Enter the model and all settings at once in $EDITOR"
+    ),
 ):
     """Add a new model profile. Interactive by default, flags supported."""
     if not name:
@@ -95,6 +126,11 @@ def add_model(
     if name in settings.models:
         confirm = typer.confirm(f"Model profile {name} already exists. Overwrite it?")
 
+    if editor:
+        if confirm:
+            _add_model_in_editor(name, model, set_item)
+        return
+
     if not model:
         model = typer.prompt("Enter model (e.g., openai:gpt-4o-mini)")
     if ":" not in model:
@@ -143,6 +179,47 @@ def add_model(
         rprint(f"Added model profile {name}")
 
 
+def _add_model_in_editor(name: str, model: str | None, set_item: list[str] | None):
+    """Collect the model and its settings in a single $EDITOR pass."""
+    from ..editor import edit_toml, toml_line, toml_value
+
+    lines = [
+        f"# Model profile: {name}",
+        "# Save and close the editor to apply, or quit without saving to abort.",
+        f"model = {toml_value(model or 'openai:gpt-4o-mini')}",
+        "",
+        "[settings]",
+        "# temperature = 0.2",
+    ]
+    for item in set_item or []:
+        if "=" in item:
+            key, raw_val = item.split("=", 1)
+            lines.append(toml_line(toml_value(key.strip()), _parse_value(raw_val)))
+
+    def validate(data: dict):
+        if ":" not in str(data.get("model", "")):
+            raise ValueError("Invalid model. Use provider:model syntax (e.g., openai:gpt-5-mini)")
+        if not isinstance(data.get("settings", {}), dict):
+            raise ValueError("'settings' must be a table")
+
+    data = edit_toml("\n".join(lines) + "\n", validate)
+    if data is None:
+        rprint("Aborted")
+        return
+
+    settings_dict = data.get("settings", {})
+    for key in settings_dict:
+        if not _is_valid_setting_key(key):
+            rprint(f"[yellow]Warning:[/] setting key may not be recognized: {key}")
+
+    settings.models[name] = {
+        "model": data["model"],
+        "settings": settings_dict,
+    }
+    settings.save()
+    rprint(f"Added model profile {name}")
+
+
 @app.command("remove")
 def remove_model(name: str = typer.Argument(None, help="Name of the model profile")):
     """Remove an existing model profile"""
@@ -1,6 +1,7 @@
+import sys
+
 import typer
 from rich import print as rprint
-from rich.table import Table
 
 from ..config import settings
 
@@ -10,12 +11,25 @@ app = typer.Typer(name="provider", help="Manage API keys for LLM providers. (lis
 @app.command("list")
 def list_keys():
     """List all registered API keys"""
+    rows = [
+        (provider, f"{key[:6]}...{key[-6:]}")
+        for provider, key in settings.providers.items()
+    ]
+
+    # Plain tab-separated lines when piped
+    if not sys.stdout.isatty():
+        for row in rows:
+            print("\t".join(row))
+        return
+
+    from rich.table import Table
+
     table = Table()
     table.add_column("Provider", justify="left")
     table.add_column("Key", justify="left")
 
-    for provider, key in settings.providers.items():
-        table.add_row(provider, f"{key[:6]}...{key[-6:]}")
+    for row in rows:
+        table.add_row(*row)
 
     rprint(table)
 
@@ -1,24 +1,109 @@
+import os
+import pickle
 import yaml
+from contextlib import contextmanager
 from pathlib import Path
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+# libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _Dumper, CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper, SafeLoader as _Loader
 
 config_path = Path.home() / ".troop" / "config.yaml"
 
+# Bump whenever the Settings schema changes so stale pickles are ignored
+CACHE_VERSION = 2
+
 # Reserved command names that cannot be used as agent names
-RESERVED_NAMES = {"provider", "mcp", "agent", "help", "version"}
+RESERVED_NAMES = frozenset({"provider", "mcp", "agent", "help", "version"})
+
+
+def _replace_file(path: Path, data: bytes, mode: int = 0o600):
+    """Atomically replace ``path`` with ``data``, giving the new file ``mode``.
+
+    The bytes go to a uniquely named sibling that is then swapped in, so a
+    crash never leaves a torn file and concurrent writers never share a
+    temp file. The temp file is created with ``mode`` and never has wider
+    permissions, since ``~/.troop`` files hold API keys.
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+
+    def opener(file, flags):
+        fd = os.open(file, flags, mode)
+        os.fchmod(fd, mode)  # not narrowed by the umask
+        return fd
+
+    try:
+        with open(tmp_path, "xb", opener=opener) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def _without_pydantic_plugins():
+    """Temporarily skip pydantic plugin discovery.
+
+    Installed plugins (e.g. logfire's, pulled in by pydantic-ai) are imported
+    the first time a model is built, adding hundreds of milliseconds to every
+    command. They still load for pydantic-ai's own models once an agent runs.
+    """
+    if "PYDANTIC_DISABLE_PLUGINS" in os.environ:
+        yield
+        return
+    os.environ["PYDANTIC_DISABLE_PLUGINS"] = "__all__"
+    try:
+        yield
+    finally:
+        del os.environ["PYDANTIC_DISABLE_PLUGINS"]
 
 
 class Settings(BaseModel):
+    # Built explicitly below, without plugins
+    model_config = ConfigDict(defer_build=True)
+
     providers: dict[str, str] = {}
     mcps: dict[str, dict] = {}
     agents: dict[str, dict] = {}
     models: dict[str, dict] = {}
     default_agent: str | None = None
+    # Number of past chat turns sent back to the model as message history
+    history_turns: int = 20
+    # Seconds to reuse an identical single-prompt (-p) response; 0 disables caching
+    prompt_cache_ttl: int = 0
+    # repr() of the values last read from or written to disk; unchanged saves are skipped
+    _saved_repr: str | None = PrivateAttr(default=None)
 
     def save(self):
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, "w") as f:
-            yaml.dump(self.model_dump(), f)
+        data = self.model_dump()
+        data_repr = repr(data)
+        if data_repr == self._saved_repr:
+            return
+        new_bytes = yaml.dump(
+            data, Dumper=_Dumper, default_flow_style=False, sort_keys=False
+        ).encode()
+        # Leave the file (and its mtime, which keys the pickle cache) alone if identical
+        try:
+            unchanged = config_path.read_bytes() == new_bytes
+            # Keep the permissions the user gave the existing file
+            mode = config_path.stat().st_mode & 0o777
+        except OSError:
+            unchanged = False
+            mode = 0o600
+        if not unchanged:
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            _replace_file(config_path, new_bytes, mode)
+        self._saved_repr = data_repr
+
+    async def asave(self):
+        """Save from async code without blocking the event loop on disk I/O."""
+        import asyncio
+
+        await asyncio.to_thread(self.save)
 
     @classmethod
     def load(cls):
@@ -26,11 +111,47 @@ class Settings(BaseModel):
         if not config_path.exists():
             return cls()
         with open(config_path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_Loader)
         if not data:
             return cls()
-        return cls(**data)
+        settings = cls(**data)
+        settings._saved_repr = repr(settings.model_dump())
+        return settings
+
+    @classmethod
+    def load_cached(cls):
+        """Load settings, reusing a pickled copy while the config file is unchanged.
+
+        The pickle lives next to the config file and is keyed on the file's
+        ``(mtime_ns, size)`` plus ``CACHE_VERSION``. Any problem with the cache
+        falls back to a regular ``load()``.
+        """
+        try:
+            st = config_path.stat()
+        except OSError:
+            return cls.load()
+        key = (st.st_mtime_ns, st.st_size, CACHE_VERSION)
+        cache_path = config_path.with_name("config.cache.pkl")
+        try:
+            with open(cache_path, "rb") as f:
+                cached_key, cached = pickle.load(f)
+            if cached_key == key and isinstance(cached, cls):
+                return cached
+        except Exception:
+            pass
+
+        settings = cls.load()
+        try:
+            # The pickle holds the same API keys as the config file
+            data = pickle.dumps((key, settings), protocol=pickle.HIGHEST_PROTOCOL)
+            _replace_file(cache_path, data)
+        except OSError:
+            pass
+        return settings
+
 
+with _without_pydantic_plugins():
+    Settings.model_rebuild(force=True)
 
 # Global settings instance to be imported elsewhere
-settings: Settings = Settings.load()
+settings: Settings = Settings.load_cached()
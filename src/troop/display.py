@@ -1,7 +1,12 @@
-import json
+import asyncio
+import contextlib
+import sys
+from pydantic_core import to_json
 from rich.console import Console
 from rich.panel import Panel
 from rich.live import Live
+from rich.style import Style
+from rich.text import Text
 from pydantic_ai.messages import (
     FunctionToolCallEvent,
     FunctionToolResultEvent,
@@ -12,15 +17,83 @@ from pydantic_ai.messages import (
 )
 
 
+def _double_quoted(value) -> bool:
+    """Whether ``repr`` of a str or bytes value picks double quotes."""
+    single, double = ("'", '"') if isinstance(value, str) else (b"'", b'"')
+    return single in value and double not in value
+
+
+def _bounded_repr(value, limit: int) -> str:
+    """Return ``repr(value)[:limit]`` without building the full repr.
+
+    Long strings and bytes are sliced before ``repr``; plain lists, tuples
+    and dicts are rendered item by item until the limit is reached.
+    """
+    kind = type(value)
+    if kind in (str, bytes, bytearray):
+        head = value[:limit]
+        if len(value) > limit and _double_quoted(head) == _double_quoted(value):
+            return repr(head)[:limit]
+        return repr(value)[:limit]
+    if kind not in (list, tuple, dict):
+        return repr(value)[:limit]
+
+    opening, closing = {list: "[]", tuple: "()", dict: "{}"}[kind]
+    parts = [opening]
+    size = 1
+    for i, item in enumerate(value.items() if kind is dict else value):
+        if i:
+            parts.append(", ")
+            size += 2
+        pieces = item if kind is dict else (item,)
+        for j, piece in enumerate(pieces):
+            if size >= limit:
+                return "".join(parts)[:limit]
+            if j:
+                parts.append(": ")
+                size += 2
+            text = _bounded_repr(piece, max(0, limit - size))
+            parts.append(text)
+            size += len(text)
+    if kind is tuple and len(value) == 1:
+        parts.append(",")
+    parts.append(closing)
+    return "".join(parts)[:limit]
+
+
+def _bounded_str(value, limit: int) -> str:
+    """Return ``str(value)[:limit]``, without stringifying large results first.
+
+    Large tool results are only shown truncated. Strings are sliced, and
+    containers and bytes, whose ``str`` is their ``repr``, are rendered only
+    up to the limit.
+    """
+    if isinstance(value, str):
+        return value[:limit]
+    if type(value) in (list, tuple, dict, bytes, bytearray):
+        return _bounded_repr(value, limit)
+    return str(value)[:limit]
+
+
 class MessageDisplay:
     """Handles all message display and formatting for the troop CLI"""
-    
+
+    __slots__ = ("console", "_pt_session", "_tool_title_style", "_user_style")
+
     def __init__(self, console: Console):
         self.console = console
+        self._pt_session = None
+        # Styles are built once; titles are Text objects so Rich skips markup parsing
+        self._tool_title_style = Style(color="yellow", bold=True)
+        self._user_style = Style(color="blue")
     
     def format_tool_params(self, args: dict) -> str:
         """Format tool parameters for display in title, max 50 chars"""
-        params = json.dumps(args, separators=(",", ":"))
+        if not args:
+            return ""
+        # Only 50 chars are shown, so long string values are cut before serializing
+        args = {k: v[:50] if isinstance(v, str) else v for k, v in args.items()}
+        params = to_json(args, fallback=str).decode()
         if len(params) > 50:
             params = params[:47] + "..."
         return params
@@ -28,14 +101,17 @@ class MessageDisplay:
     def show_tool_execution(self, tool_name: str, args: dict, result: str):
         """Display tool execution with function-style title and result content"""
         params = self.format_tool_params(args)
-        title = f"{tool_name} {params}"
+        title = f"{tool_name} {params}" if params else tool_name
         
         # Truncate result if too long
         if len(result) > 500:
             result = result[:497] + "..."
         
+        # Plain Text also keeps brackets in args/results from being read as markup
         panel = Panel(
-            result, title=f"[bold yellow]{title}[/bold yellow]", border_style="yellow"
+            Text(result),
+            title=Text(title, style=self._tool_title_style),
+            border_style="yellow",
         )
         self.console.print(panel)
         self.console.print()
@@ -43,77 +119,139 @@ class MessageDisplay:
     def show_user_message(self, message: str):
         """Display user message in a panel"""
         self.console.print()
-        user_panel = Panel(message, title="User", border_style="blue")
+        user_panel = Panel(message, title=Text("User"), border_style=self._user_style)
         self.console.print(user_panel)
         self.console.print()
     
-    def prompt_user_input(self) -> str:
-        """Prompt for user input with formatted prefix"""
-        self.console.print("[bold green]>[/bold green]", sep="", end="")
-        import typer
-        message = typer.prompt("", type=str, prompt_suffix="")
+    async def prompt_user_input(self) -> str:
+        """Prompt for user input with formatted prefix.
+
+        Async because the chat loop already runs inside the event loop, where
+        prompt_toolkit's blocking ``prompt()`` would try to start another one.
+        """
+        session = self._prompt_session()
+        if session is None:
+            self.console.print("[bold green]>[/bold green]", sep="", end="")
+            import typer
+            message = typer.prompt("", type=str, prompt_suffix="")
+        else:
+            try:
+                message = await session.prompt_async([("bold ansigreen", ">")])
+            except EOFError:
+                # Ctrl-D ends the chat the same way it does under typer.prompt
+                import click
+                raise click.exceptions.Abort() from None
         self.console.print()  # Line break after user input
         return message
+
+    def _prompt_session(self):
+        """Interactive prompt_toolkit session, created once and reused across turns.
+
+        Keeps input history and key bindings between prompts. Returns None when
+        prompt_toolkit is unavailable or the terminal is not interactive.
+        """
+        if self._pt_session is None:
+            if not (sys.stdin.isatty() and self.console.is_terminal):
+                return None
+            try:
+                from prompt_toolkit import PromptSession
+            except ImportError:
+                self._pt_session = False
+            else:
+                self._pt_session = PromptSession()
+        return self._pt_session or None
     
     async def stream_agent_response(self, text_content: str, agent_name: str) -> Panel:
         """Create a panel for streaming agent response"""
         return Panel(
             text_content,
-            title=agent_name.capitalize(),
-            border_style="blue",
+            title=Text(agent_name.capitalize()),
+            border_style=self._user_style,
         )
     
-    async def stream_simple_response(self, result):
-        """Stream response chunks to console without panels"""
-        async for chunk in result.stream_text(delta=True):
-            self.console.print(chunk, sep="", end="")
+    def show_agent_response(self, text_content: str, agent_name: str):
+        """Display a complete agent response in the same panel used for streaming"""
+        self.console.print(
+            Panel(
+                text_content,
+                title=Text(agent_name.capitalize()),
+                border_style=self._user_style,
+            )
+        )
         self.console.print()
-    
+
     async def handle_streaming_events(self, event_stream, agent_name: str):
         """Handle streaming events from agent model request"""
-        text_content = ""
+        parts: list[str] = []
+        size = 0
         panel = None
         live = None
-        
-        async for event in event_stream:
-            if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
-                text_content = event.part.content
-                # Start streaming display
-                panel = await self.stream_agent_response(text_content, agent_name)
-                live = Live(panel, console=self.console, refresh_per_second=10)
-                live.start()
-            elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
-                text_content += event.delta.content_delta
-                if panel and live:
-                    panel.renderable = text_content
-                    live.update(panel)
-        
-        # Stop the live display
-        if live:
+        ticker = None
+        dirty = asyncio.Event()
+
+        async def refresh():
+            # Renders on its own schedule, decoupled from how fast deltas arrive.
+            # Each render lays out the whole text, so long responses refresh less often.
+            while True:
+                await dirty.wait()
+                dirty.clear()
+                panel.renderable = "".join(parts)
+                live.update(panel, refresh=True)
+                await asyncio.sleep(0.1 if size <= 2048 else 0.25)
+
+        async def finish():
+            ticker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await ticker
+            panel.renderable = "".join(parts)
+            live.update(panel, refresh=True)
             live.stop()
             self.console.print()  # Add newline after panel
-        
-        return text_content
-    
+
+        try:
+            async for event in event_stream:
+                if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                    if live:
+                        await finish()
+                    parts = [event.part.content]
+                    size = len(event.part.content)
+                    # Start streaming display; only the ticker refreshes it
+                    panel = await self.stream_agent_response(event.part.content, agent_name)
+                    live = Live(panel, console=self.console, auto_refresh=False)
+                    live.start(refresh=True)
+                    ticker = asyncio.create_task(refresh())
+                elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                    parts.append(event.delta.content_delta)
+                    size += len(event.delta.content_delta)
+                    dirty.set()
+        finally:
+            # Stop the live display with a final render of the complete text
+            if live:
+                await finish()
+
+        return "".join(parts)
+
     async def handle_tool_events(self, tool_stream, verbose: bool):
         """Handle tool call and result events"""
-        tool_calls = {}  # Store tool calls by their ID
-        
+        # Pending tool calls by ID, kept as two flat maps rather than a dict per call
+        names: dict[str, str] = {}
+        args: dict[str, dict] = {}
+
         async for event in tool_stream:
-            if isinstance(event, FunctionToolCallEvent):
-                # Store the tool call information
-                tool_calls[event.part.tool_call_id] = {
-                    "name": event.part.tool_name,
-                    "args": event.part.args_as_dict(),
-                }
+            # Calls are only recorded (and their JSON args parsed) when they'll be shown
+            if isinstance(event, FunctionToolCallEvent) and verbose:
+                call_id = event.part.tool_call_id
+                names[call_id] = event.part.tool_name
+                args[call_id] = event.part.args_as_dict()
             elif isinstance(event, FunctionToolResultEvent) and verbose:
-                # Get the corresponding tool call
-                tool_info = tool_calls.get(event.tool_call_id)
-                if tool_info:
+                name = names.pop(event.tool_call_id, None)
+                call_args = args.pop(event.tool_call_id, None)
+                if name is not None:
                     self.show_tool_execution(
-                        tool_info["name"],
-                        tool_info["args"],
-                        str(event.result.content),
+                        name,
+                        call_args,
+                        # One char past the 500 shown, so truncation is still detected
+                        _bounded_str(event.result.content, 501),
                     )
     
     def print_dim(self, message: str):
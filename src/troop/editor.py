@@ -0,0 +1,54 @@
+import json
+import tomllib
+from typing import Callable
+
+import click
+
+
+def toml_value(value) -> str:
+    """Render a JSON-compatible value as a TOML literal."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, list):
+        return "[" + ", ".join(toml_value(v) for v in value if v is not None) + "]"
+    if isinstance(value, dict):
+        items = (f"{json.dumps(str(k))} = {toml_value(v)}" for k, v in value.items() if v is not None)
+        return "{" + ", ".join(items) + "}"
+    if value is None:
+        raise ValueError("TOML has no null value")
+    # JSON string escapes are valid TOML basic-string escapes
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def toml_line(key: str, value) -> str:
+    """Render ``key = value``; None has no TOML form, so the line is commented out."""
+    if value is None:
+        return f"# {key} ="
+    return f"{key} = {toml_value(value)}"
+
+
+def edit_toml(template: str, validate: Callable[[dict], None] | None = None) -> dict | None:
+    """Open $EDITOR on a TOML template and return the parsed document.
+
+    If parsing or ``validate`` raises ``ValueError``, the editor is re-opened
+    with the error prepended as a comment. Returns None if the editor is
+    closed without saving.
+    """
+    text = template
+    while True:
+        edited = click.edit(text, extension=".toml", require_save=True)
+        if edited is None:
+            return None
+        try:
+            data = tomllib.loads(edited)
+            if validate is not None:
+                validate(data)
+            return data
+        except ValueError as e:
+            body = "".join(
+                line for line in edited.splitlines(keepends=True)
+                if not line.startswith("# Error:")
+            )
+            text = f"# Error: {e}\n{body}"
@@ -1,21 +1,48 @@
 from __future__ import annotations
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Any
 
 from pydantic_ai import Agent
 from pydantic_ai.models import infer_model
 from pydantic_ai.settings import ModelSettings
 
+from .cache import PromptCache
 from .config import Settings
-from .utils import get_tools, get_model, setup_provider_env
+from .utils import get_servers, get_model, setup_provider_env, start_servers
 from .display import MessageDisplay
 
+# Marks the end of one node's events, or of the whole run when kind is None
+_END = object()
+
+
+async def _segment(queue: asyncio.Queue):
+    """Yield queued events until the end-of-node marker."""
+    while True:
+        _, event = await queue.get()
+        if event is _END:
+            return
+        yield event
+
 
 class AgentRunner:
     """Thin wrapper to build and run a pydantic_ai Agent from config."""
 
-    def __init__(self, agent: Agent, name: str):
+    def __init__(
+        self,
+        agent: Agent,
+        name: str,
+        cache: PromptCache | None = None,
+        cache_scope: str = "",
+        servers: list | None = None,
+    ):
         self.agent = agent
         self.name = name
+        # MCP servers attached to the agent, started together by start_servers()
+        self.servers = servers or []
+        self.cache = cache
+        # Identifies model + instructions so cached responses never cross agents
+        self.cache_scope = cache_scope
 
     @classmethod
     def from_config(
@@ -27,17 +54,49 @@ class AgentRunner:
         if agent_name not in settings.agents:
             raise KeyError(f"Unknown agent: {agent_name}")
         agent_cfg = settings.agents[agent_name]
-        model = get_model(model_name or agent_cfg.get("model"), settings)
-        tools = get_tools(agent_name, settings)
-        setup_provider_env(model, settings.providers)
+        model_name = model_name or agent_cfg.get("model")
+        if not model_name:
+            raise ValueError(
+                f"No model specified for agent {agent_name}; pass --model or set one with 'troop agent edit'"
+            )
+        # Export the API key first; the provider reads it when the model is built
+        setup_provider_env(model_name, settings)
+        model = get_model(model_name, settings)
+        servers = get_servers(settings, agent_name)
 
         kwargs: dict[str, Any] = {
             "model": model,
             "instructions": agent_cfg["instructions"],
-            "tools": tools,
+            "toolsets": servers,
         }
 
-        return cls(agent=Agent(**kwargs), name=agent_name)
+        cache = None
+        if settings.prompt_cache_ttl > 0:
+            cache = PromptCache(ttl=settings.prompt_cache_ttl)
+        cache_scope = "\0".join(
+            (model.system, model.model_name, repr(model.settings), agent_cfg["instructions"])
+        )
+
+        return cls(
+            agent=Agent(**kwargs),
+            name=agent_name,
+            cache=cache,
+            cache_scope=cache_scope,
+            servers=servers,
+        )
+
+    @asynccontextmanager
+    async def running(self):
+        """Start all MCP servers concurrently, then enter the agent.
+
+        The prompt cache, if any, is closed on exit.
+        """
+        try:
+            async with start_servers(self.servers), self.agent:
+                yield self
+        finally:
+            if self.cache is not None:
+                self.cache.close()
 
     async def run_once(
         self,
@@ -46,13 +105,55 @@ class AgentRunner:
         verbose: bool,
         message_history: list | None = None,
     ):
-        """Run agent using iter() to capture tool calls and streaming output."""
+        """Run agent using iter() to capture tool calls and streaming output.
+
+        Single-prompt runs (``message_history=None``) are served from the
+        prompt cache when enabled; a cache hit returns ``None``.
+        """
+        key = None
+        if self.cache is not None and message_history is None:
+            key = PromptCache.make_key(self.cache_scope, prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                display.show_agent_response(cached, self.name)
+                return None
+
         async with self.agent.iter(prompt, message_history=message_history) as run:
-            async for node in run:
-                if Agent.is_model_request_node(node):
-                    async with node.stream(run.ctx) as req_stream:
-                        await display.handle_streaming_events(req_stream, self.name)
-                elif Agent.is_call_tools_node(node):
-                    async with node.stream(run.ctx) as tool_stream:
-                        await display.handle_tool_events(tool_stream, verbose)
+            # The model run and terminal rendering run as separate tasks; the
+            # bounded queue only stalls the model when the terminal falls behind.
+            queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(self._produce(run, queue))
+                    tg.create_task(self._consume(queue, display, verbose))
+            except BaseExceptionGroup as group:
+                # Re-raise the original error so callers' except clauses still apply
+                raise group.exceptions[0] from None
+        if key is not None and isinstance(run.result.output, str):
+            self.cache.put(key, run.result.output)
         return run.result
+
+    async def _produce(self, run, queue: asyncio.Queue):
+        async for node in run:
+            if Agent.is_model_request_node(node):
+                kind = "model"
+            elif Agent.is_call_tools_node(node):
+                kind = "tool"
+            else:
+                continue
+            async with node.stream(run.ctx) as stream:
+                await queue.put((kind, None))
+                async for event in stream:
+                    await queue.put((kind, event))
+            await queue.put((kind, _END))
+        await queue.put((None, _END))
+
+    async def _consume(self, queue: asyncio.Queue, display: MessageDisplay, verbose: bool):
+        while True:
+            kind, _ = await queue.get()
+            if kind is None:
+                return
+            if kind == "model":
+                await display.handle_streaming_events(_segment(queue), self.name)
+            else:
+                await display.handle_tool_events(_segment(queue), verbose)
@@ -1,24 +1,47 @@
 import os
+import sys
+import atexit
 import asyncio
-from functools import wraps
-from contextlib import asynccontextmanager
+from functools import lru_cache, wraps
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Optional
 
 from pydantic_ai.mcp import MCPServerStdio
 from pydantic_ai.models import Model, infer_model
 from pydantic_ai.settings import ModelSettings
 
+from .cache import ToolCache
 from .config import Settings
 
+_MISSING = object()
+
+# Use uvloop's faster event loop when the optional "fast" extra is installed
+_loop_factory = None
+if sys.platform != "win32":
+    try:
+        import uvloop
+
+        _loop_factory = uvloop.new_event_loop
+    except ImportError:
+        pass
+
 
 def run_async(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        return asyncio.run(f(*args, **kwargs))
+        return asyncio.run(f(*args, **kwargs), loop_factory=_loop_factory)
 
     return wrapper
 
 
+@lru_cache(maxsize=None)
+def _devnull():
+    """Process-wide ``os.devnull`` handle shared by every MCP subprocess."""
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    atexit.register(devnull.close)
+    return devnull
+
+
 class QuietMCPServer(MCPServerStdio):
     """A version of ``MCPServerStdio`` that suppresses *all* output coming from the
     MCP server's **stderr** stream.
@@ -26,8 +49,50 @@ class QuietMCPServer(MCPServerStdio):
     We can't just redirect the server's *stdout* because that is where the JSON‑RPC
     protocol messages are sent.  Instead we override ``client_streams`` so we can
     hand our own ``errlog`` (``os.devnull``) to ``mcp.client.stdio.stdio_client``.
+
+    The tool list is also fetched only once per connection instead of on every
+    model request, so chat turns don't pay a ``list_tools`` round-trip each step.
+    The ``ToolsetTool`` wrappers pydantic-ai builds from that list are kept too.
     """
 
+    _cached_tools = None
+    _cached_toolset_tools = None
+    # Set for servers configured with ``cache: true`` to reuse identical calls
+    tool_cache: ToolCache | None = None
+
+    async def list_tools(self):  # type: ignore[override]
+        """Return the server's tools, fetched once while the connection is open."""
+        if self._cached_tools is None:
+            self._cached_tools = await super().list_tools()
+        return self._cached_tools
+
+    async def get_tools(self, ctx):  # type: ignore[override]
+        """Return pydantic-ai tool wrappers, built once per connection."""
+        # The definitions only depend on the tool list, never on the run context
+        if self._cached_toolset_tools is None:
+            self._cached_toolset_tools = await super().get_tools(ctx)
+        return self._cached_toolset_tools
+
+    async def direct_call_tool(self, name, args, metadata=None):  # type: ignore[override]
+        """Call a tool, answering repeated identical calls from ``tool_cache``."""
+        if self.tool_cache is None:
+            return await super().direct_call_tool(name, args, metadata)
+        key = ToolCache.make_key(name, args)
+        result = self.tool_cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = await super().direct_call_tool(name, args, metadata)
+            self.tool_cache.put(key, result)
+        return result
+
+    async def __aexit__(self, *args):
+        try:
+            return await super().__aexit__(*args)
+        finally:
+            # A reconnect may expose a different tool set
+            if not self.is_running:
+                self._cached_tools = None
+                self._cached_toolset_tools = None
+
     @asynccontextmanager
     async def client_streams(self):  # type: ignore[override]
         """Start the subprocess exactly like the parent class but silence *stderr*."""
@@ -37,49 +102,100 @@ class QuietMCPServer(MCPServerStdio):
 
         server_params = StdioServerParameters(
             command=self.command,
-            args=list(self.args),
+            args=self.args if isinstance(self.args, list) else list(self.args),
             env=self.env or os.environ,
         )
 
-        # Open ``/dev/null`` for the lifetime of the subprocess so anything the
-        # server writes to *stderr* is discarded.
+        # Anything the server writes to *stderr* goes to ``/dev/null``; the handle
+        # is opened once and reused across (re)starts.
         #
         # This is to help with noisy MCP's that have options for verbosity
-        with open(os.devnull, "w", encoding=server_params.encoding) as devnull:
-            try:
-                async with stdio_client(server=server_params, errlog=devnull) as (
-                    read_stream,
-                    write_stream,
-                ):
-                    yield read_stream, write_stream
-            except GeneratorExit:
-                # Silently handle generator cleanup
-                pass
-            except Exception as e:
-                # Log the error but don't re-raise during cleanup
-                logging.debug(f"Error during MCP server cleanup: {e}")
-                raise
-
-
-def get_tools(agent_name: str, settings: Settings) -> list:
-    tools = []
-    mcps = settings.agents[agent_name].get("mcps") or []
-    missing = [mcp for mcp in mcps if mcp not in settings.mcps]
+        try:
+            async with stdio_client(server=server_params, errlog=_devnull()) as (
+                read_stream,
+                write_stream,
+            ):
+                yield read_stream, write_stream
+        except GeneratorExit:
+            # Silently handle generator cleanup
+            pass
+        except Exception as e:
+            # Log the error but don't re-raise during cleanup
+            logging.debug(f"Error during MCP server cleanup: {e}")
+            raise
+
+
+@asynccontextmanager
+async def start_servers(servers: list, limit: int = 8):
+    """Start MCP servers concurrently and keep them running for the block.
+
+    Entering an agent starts its servers one after another. Here each server
+    is entered (and later exited) in its own task, as anyio requires, with at
+    most ``limit`` starting at once, and each server's tool list is fetched as
+    soon as it is up. Entering the agent inside the block then reuses the
+    running connections.
+    """
+    if len(servers) < 2:
+        yield
+        return
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(limit)
+    stop = asyncio.Event()
+    started = [loop.create_future() for _ in servers]
+
+    async def hold(server, ready: asyncio.Future):
+        try:
+            async with AsyncExitStack() as stack:
+                async with semaphore:
+                    await stack.enter_async_context(server)
+                # Fetch (and cache) the tool list while the other servers are still starting
+                if isinstance(server, QuietMCPServer):
+                    await server.list_tools()
+                ready.set_result(None)
+                await stop.wait()
+        except asyncio.CancelledError:
+            ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+
+    tasks = [asyncio.create_task(hold(s, f)) for s, f in zip(servers, started)]
+    try:
+        await asyncio.gather(*started)
+        yield
+    finally:
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Mark secondary startup errors as retrieved; the first one was raised
+        for future in started:
+            if future.done() and not future.cancelled():
+                future.exception()
+
+
+def get_servers(settings: Settings, agent_name: str) -> list[QuietMCPServer]:
+    """Build the MCP servers configured for an agent."""
+    servers = []
+    names = settings.agents[agent_name].get("servers") or []
+    missing = set(names).difference(settings.mcps.keys())
     if missing:
-        raise KeyError(f"Unknown MCP servers: {', '.join(missing)}")
-    for mcp in mcps:
-        env = os.environ.copy()
-        if "env" in mcp:
-            env.update(mcp["env"])
-
-        tools.append(
-            QuietMCPServer(
-                command=mcp["command"][0],
-                args=mcp["command"][1:],
-                env=env,
-            )
+        raise KeyError(f"Unknown MCP servers: {', '.join(sorted(missing))}")
+    # One copy of the environment shared by every server without overrides
+    base_env = os.environ.copy()
+    for name in names:
+        mcp = settings.mcps[name]
+        env = {**base_env, **mcp["env"]} if mcp.get("env") else base_env
+
+        server = QuietMCPServer(
+            command=mcp["command"][0],
+            args=mcp["command"][1:],
+            env=env,
         )
-    return tools
+        if mcp.get("cache"):
+            server.tool_cache = ToolCache(ttl=mcp.get("cache_ttl", 600))
+        servers.append(server)
+    return servers
 
 def get_model(model_name: str, settings) -> Model:
     if model_name in settings.models:
@@ -96,16 +212,51 @@ def get_model(model_name: str, settings) -> Model:
 PROVIDER_ENV_VARS = {
     "openai": "OPENAI_API_KEY",
     "anthropic": "ANTHROPIC_API_KEY",
-    "gemini": "GEMINI_API_KEY",
+    # GoogleProvider reads GOOGLE_API_KEY first; GEMINI_API_KEY is only a fallback
+    "gemini": "GOOGLE_API_KEY",
+}
+
+
+# Model-string prefixes that read another provider's API key
+PROVIDER_ALIASES = {
+    "openai-chat": "openai",
+    "openai-responses": "openai",
+    "google-gla": "gemini",
 }
 
 
-def setup_provider_env(model: Model, providers: dict) -> Optional[str]:
+def _provider_of(model_name: str) -> str | None:
+    """Provider pydantic_ai will pick for a model string, without building it."""
+    if ":" in model_name:
+        provider = model_name.split(":", 1)[0].lower()
+    elif model_name.startswith(("gpt", "o1", "o3")):
+        provider = "openai"
+    elif model_name.startswith("claude"):
+        provider = "anthropic"
+    elif model_name.startswith("gemini"):
+        provider = "gemini"
+    else:
+        return None
+    return PROVIDER_ALIASES.get(provider, provider)
+
+
+def setup_provider_env(model_name: str | None, settings) -> Optional[str]:
     """Set the correct API key env var based on provider.
-    Returns the provider if an env var was set.
+
+    Must run before ``get_model``: pydantic_ai providers read their key from
+    the environment when the model is built. Returns the provider if an env
+    var was set.
     """
-    provider = model.system.lower()
-    if provider in providers and provider in PROVIDER_ENV_VARS:
-        os.environ[PROVIDER_ENV_VARS[provider]] = providers[provider]
-        return provider
-    return None
+    if not model_name:
+        return None
+    if model_name in settings.models:
+        model_name = settings.models[model_name].get("model") or ""
+    provider = _provider_of(model_name)
+    env_var = PROVIDER_ENV_VARS.get(provider)
+    key = settings.providers.get(provider)
+    if env_var is None or key is None:
+        return None
+    # Skip the environ write (and its putenv call) when the key is already exported
+    if os.environ.get(env_var) != key:
+        os.environ[env_var] = key
+    return provider
@@ -10,6 +10,72 @@ import asyncio
 from troop.config import Settings
 
 
+class _FakeAgentCtx:
+    """Stand-in for the context manager returned by ``Agent.iter``; yields no nodes."""
+
+    def __init__(self, result=None, enter_exc=None):
+        self.result = result or MagicMock()
+        self._exc = enter_exc
+
+    async def __aenter__(self):
+        if self._exc:
+            raise self._exc
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def __aiter__(self):
+        return
+        yield
+
+
+class _FakeAgent:
+    """Stand-in for ``pydantic_ai.Agent`` whose ``iter()`` returns ``ctx``."""
+
+    def __init__(self, ctx):
+        self._ctx = ctx
+        self.iter = MagicMock(return_value=ctx)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+@pytest.fixture
+def agent_iter_mocks(monkeypatch):
+    """Patch ``troop.runner.Agent``; yields ``(agent_class, agent, ctx)``."""
+    import troop.runner
+
+    ctx = _FakeAgentCtx()
+    agent = _FakeAgent(ctx)
+    agent_class = MagicMock(return_value=agent)
+    monkeypatch.setattr(troop.runner, "Agent", agent_class)
+    return agent_class, agent, ctx
+
+
+@pytest.fixture
+def use_settings():
+    """Point troop at a copy of the given Settings for one test.
+
+    Goes through ``troop.app.rebuild`` and restores the original settings
+    afterwards. Copying keeps shared module-level Settings constants
+    unchanged by any test.
+    """
+    from troop import config
+    from troop.app import rebuild
+
+    original = config.settings
+
+    def use(settings: Settings):
+        rebuild(settings.model_copy(deep=True))
+
+    yield use
+    rebuild(original)
+
+
 @pytest.fixture
 def temp_config_dir():
     """Create a temporary directory for config files."""
@@ -81,14 +147,6 @@ def mock_agent():
     return agent
 
 
-@pytest.fixture
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture
 def mock_console():
     """Mock Rich console for testing output."""
@@ -147,16 +205,28 @@ def isolate_environment(monkeypatch):
     env_vars_to_clear = [
         "OPENAI_API_KEY",
         "ANTHROPIC_API_KEY",
+        "GOOGLE_API_KEY",
+        "GEMINI_API_KEY",
         "BRAVE_SEARCH_API_KEY",
     ]
     for var in env_vars_to_clear:
-        monkeypatch.delenv(var, raising=False)
+        # setenv first so monkeypatch restores the original state even when a
+        # test (e.g. via setup_provider_env) exports the variable itself
+        monkeypatch.setenv(var, "")
+        monkeypatch.delenv(var)
     
     # Set test-specific environment variables if needed
     monkeypatch.setenv("TROOP_TEST_MODE", "1")
 
 
 # CLI testing helpers
+@pytest.fixture(scope="module")
+def runner():
+    """One CliRunner per test module; each invoke() isolates its own I/O."""
+    from typer.testing import CliRunner
+    return CliRunner()
+
+
 @pytest.fixture
 def cli_invoke():
     """Helper function to invoke CLI commands with proper error handling."""
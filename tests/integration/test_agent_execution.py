@@ -1,63 +1,112 @@
 import pytest
-import asyncio
-from unittest.mock import patch, MagicMock, AsyncMock, call
-from typer.testing import CliRunner
+from unittest.mock import MagicMock, AsyncMock
+import typer
+import troop.commands.agent
+import troop.commands.mcp
+import troop.config
+import troop.runner
+from troop.app import app, create_agent_command, interactive_loop
 from troop.config import Settings
-from pydantic_ai import Agent
-from rich.console import Console
+from tests.conftest import _FakeAgent, _FakeAgentCtx
 
+_GPT4_NAMES = frozenset({
+    "gpt-4", "gpt-4o", "gpt-4-0125-preview", "gpt-4-0613",
+    "gpt-4-1106-preview", "gpt-4-turbo", "gpt-4o-mini",
+})
 
-class TestAgentExecution:
-    @pytest.fixture
-    def runner(self):
-        return CliRunner()
+# Under --dist loadgroup, these tests share one xdist worker
+pytestmark = pytest.mark.xdist_group("agent_exec")
+
+
+# Built once; use_settings hands each test its own copy
+_SETTINGS_WITH_AGENT = Settings(
+    providers={"openai": "sk-test"},
+    mcps={
+        "test-server": {
+            "command": ["echo", "test"],
+            "env": {"TEST": "true"}
+        }
+    },
+    agents={
+        "test-agent": {
+            "instructions": "You are a test agent",
+            "model": "openai:gpt-4",
+            "servers": ["test-server"]
+        }
+    },
+)
+
+_SETTINGS_CHAT = Settings(
+    providers={"openai": "sk-test"},
+    agents={
+        "chat": {
+            "instructions": "You are a chat agent",
+            "model": "gpt-4",
+            "servers": []
+        }
+    }
+)
+
+_SETTINGS_STREAM = Settings(
+    providers={"openai": "sk-test"},
+    agents={
+        "stream-test": {
+            "instructions": "Test streaming",
+            "model": "gpt-4",
+            "servers": []
+        }
+    }
+)
+
+_SETTINGS_ERROR = Settings(
+    providers={"openai": "sk-test"},
+    agents={
+        "error-test": {
+            "instructions": "Test error handling",
+            "model": "gpt-4",
+            "servers": ["error-server"]
+        }
+    },
+    mcps={
+        "error-server": {
+            "command": ["error"],
+            "env": {}
+        }
+    }
+)
 
+_SETTINGS_DYNAMIC = Settings(
+    providers={"openai": "sk-test"},
+    agents={
+        "dynamic1": {
+            "instructions": "First dynamic agent",
+            "model": "gpt-4",
+            "servers": []
+        },
+        "dynamic2": {
+            "instructions": "Second dynamic agent",
+            "model": "gpt-4",
+            "servers": []
+        }
+    }
+)
+
+
+class TestAgentExecution:
     @pytest.fixture
     def mock_settings_with_agent(self):
-        """Create settings with a test agent configured."""
-        return Settings(
-            api_keys={"openai": "sk-test"},
-            mcp_servers={
-                "test-server": {
-                    "command": ["echo", "test"],
-                    "env": {"TEST": "true"}
-                }
-            },
-            agents={
-                "test-agent": {
-                    "instructions": "You are a test agent",
-                    "model": "openai:gpt-4",
-                    "mcp_servers": ["test-server"]
-                }
-            },
-            default_model="openai:gpt-4"
-        )
+        """Settings with a test agent configured."""
+        return _SETTINGS_WITH_AGENT
 
-    @patch('troop.config.Settings.load')
-    @patch('troop.runner.Agent')
-    @patch('troop.utils.get_servers')
-    async def test_run_agent_single_prompt(self, mock_get_servers, mock_agent_class, mock_load, mock_settings_with_agent, runner):
+    def test_run_agent_single_prompt(self, mock_settings_with_agent, runner, agent_iter_mocks, monkeypatch, use_settings):
         """Test running an agent with a single prompt."""
-        mock_load.return_value = mock_settings_with_agent
+        mock_agent_class, mock_agent, _ = agent_iter_mocks
         
         # Mock toolsets
-        mock_get_servers.return_value = []
-        
-        # Mock Agent.iter context manager
-        mock_agent = MagicMock()
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__.return_value = mock_ctx
-        mock_ctx.__aexit__.return_value = None
-        async def _empty():
-            if False:
-                yield None
-        mock_ctx.__aiter__.return_value = _empty()
-        mock_ctx.result = MagicMock()
-        mock_agent.iter.return_value = mock_ctx
-        mock_agent_class.return_value = mock_agent
-        
-        # Import app after settings are mocked
-        from troop.app import app
+        servers = []
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: servers)
+        
+        use_settings(mock_settings_with_agent)
         
         # Run the agent command
         result = runner.invoke(app, ["test-agent", "-p", "Test prompt"])
@@ -73,20 +122,18 @@ class TestAgentExecution:
         else:
             # Accept model object: check provider and name
             assert getattr(actual_model, "system", None) == "openai"
-            assert getattr(actual_model, "model_name", None) in {"gpt-4", "gpt-4o", "gpt-4-0125-preview", "gpt-4-0613", "gpt-4-1106-preview", "gpt-4-turbo", "gpt-4o-mini"} or getattr(actual_model, "model_name", None).startswith("gpt-4")
-        assert kwargs.get("system_prompt") == "You are a test agent"
-        assert kwargs.get("toolsets") == mock_get_servers.return_value
+            name = getattr(actual_model, "model_name", "")
+            assert name in _GPT4_NAMES or name.startswith("gpt-4")
+        assert kwargs.get("instructions") == "You are a test agent"
+        assert kwargs.get("toolsets") == servers
         
         # Verify iter-based execution was invoked
         mock_agent.iter.assert_called_once()
 
-    @patch('troop.config.Settings.load')
-    def test_main_no_agents(self, mock_load, runner):
+    def test_main_no_agents(self, runner, use_settings):
         """Test main app when no agents are configured."""
-        mock_load.return_value = Settings()  # No agents
         
-        # Import app after mocking
-        from troop.app import app
+        use_settings(Settings())  # No agents
         
         result = runner.invoke(app, ["--help"])
         
@@ -95,68 +142,34 @@ class TestAgentExecution:
         assert "provider" in result.stdout
         assert "agent" in result.stdout
 
-    @patch('troop.config.Settings.load')
-    def test_main_agent_not_found(self, mock_load, runner, mock_settings_with_agent):
+    def test_main_agent_not_found(self, runner, mock_settings_with_agent, use_settings):
         """Test main app when specified agent doesn't exist."""
-        mock_load.return_value = mock_settings_with_agent
-        
-        from troop.app import app
+        use_settings(mock_settings_with_agent)
         
-        result = runner.invoke(app, ["nonexistent-agent"], mix_stderr=True)
+        result = runner.invoke(app, ["nonexistent-agent"])
         assert result.exit_code == 2
-        # Click/Typer error messages go to stderr; be flexible here
-        assert ("No such command" in result.stdout
-                or "No such option" in result.stdout
-                or "Invalid value" in result.stdout
-                or "Usage:" in result.stdout)
+        # Click usage errors go to stderr, which result.output includes
+        assert "No such command" in result.output
 
-    @patch('troop.config.Settings.load')
-    @patch('troop.runner.Agent')
-    @patch('troop.utils.get_servers')
-    def test_main_with_prompt_flag(self, mock_get_servers, mock_agent_class, mock_load, runner, mock_settings_with_agent):
+    def test_main_with_prompt_flag(self, runner, mock_settings_with_agent, agent_iter_mocks, monkeypatch, use_settings):
         """Test running agent with --prompt flag."""
-        mock_load.return_value = mock_settings_with_agent
-        
-        # Mock Agent.iter context manager
-        mock_agent = MagicMock()
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__.return_value = mock_ctx
-        mock_ctx.__aexit__.return_value = None
-        async def _empty():
-            if False:
-                yield None
-        mock_ctx.__aiter__.return_value = _empty()
-        mock_ctx.result = MagicMock()
-        mock_agent.iter.return_value = mock_ctx
-        mock_agent_class.return_value = mock_agent
-        
-        from troop.app import app
+        mock_agent_class, mock_agent, _ = agent_iter_mocks
+        servers = []
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: servers)
+        
+        use_settings(mock_settings_with_agent)
         
         result = runner.invoke(app, ["test-agent", "--prompt", "Test prompt"])
         
         assert result.exit_code == 0
 
-    @patch('troop.config.Settings.load')
-    @patch('troop.runner.Agent')
-    @patch('troop.utils.get_servers')
-    def test_main_with_model_override(self, mock_get_servers, mock_agent_class, mock_load, runner, mock_settings_with_agent):
+    def test_main_with_model_override(self, runner, mock_settings_with_agent, agent_iter_mocks, monkeypatch, use_settings):
         """Test running agent with --model flag."""
-        mock_load.return_value = mock_settings_with_agent
-        
-        # Mock Agent.iter context manager
-        mock_agent = MagicMock()
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__.return_value = mock_ctx
-        mock_ctx.__aexit__.return_value = None
-        async def _empty():
-            if False:
-                yield None
-        mock_ctx.__aiter__.return_value = _empty()
-        mock_ctx.result = MagicMock()
-        mock_agent.iter.return_value = mock_ctx
-        mock_agent_class.return_value = mock_agent
-        
-        from troop.app import app
+        mock_agent_class, mock_agent, _ = agent_iter_mocks
+        servers = []
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: servers)
+        
+        use_settings(mock_settings_with_agent)
         
         result = runner.invoke(app, ["test-agent", "-p", "Test", "-m", "gpt-3.5-turbo"])
         
@@ -170,79 +183,35 @@ class TestAgentExecution:
         else:
             assert getattr(actual_model, "system", None) == "openai"
             assert getattr(actual_model, "model_name", None) == "gpt-3.5-turbo"
-        assert kwargs.get("system_prompt") == "You are a test agent"
-        assert kwargs.get("toolsets") == mock_get_servers.return_value
+        assert kwargs.get("instructions") == "You are a test agent"
+        assert kwargs.get("toolsets") == servers
 
-    @patch('troop.config.Settings.load')
-    @patch('troop.runner.Agent')
-    @patch('troop.utils.get_servers')
-    @patch('troop.app.typer.prompt')
-    async def test_run_agent_interactive_mode(self, mock_prompt, mock_get_servers, mock_agent_class, mock_load, runner):
+    def test_run_agent_interactive_mode(self, runner, agent_iter_mocks, monkeypatch, use_settings):
         """Test running agent in interactive mode (REPL)."""
-        settings = Settings(
-            api_keys={"openai": "sk-test"},
-            agents={
-                "chat": {
-                    "instructions": "You are a chat agent",
-                    "model": "gpt-4",
-                    "mcp_servers": []
-                }
-            }
-        )
-        mock_load.return_value = settings
-        
-        # Mock agent (unused further since interactive loop is complex)
-        mock_agent = AsyncMock()
-        mock_agent_class.return_value = mock_agent
-        # Mock user inputs
-        mock_prompt.side_effect = ["Hello", "exit"]
-        
-        # Mock agent responses
-        mock_result1 = MagicMock()
-        mock_result1.data = "Hi there!"
-        mock_agent.run.side_effect = [mock_result1]
+        _, mock_agent, _ = agent_iter_mocks
+        servers = []
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: servers)
+        # Mock user inputs; Ctrl+C after the first turn ends the chat
+        mock_prompt = MagicMock(side_effect=["Hello", KeyboardInterrupt()])
+        monkeypatch.setattr(typer, "prompt", mock_prompt)
         
-        # We won't assert deep behavior here to keep this lightweight.
-        mock_result1.new_messages.return_value = []
-        
-        from troop.app import app
+        use_settings(_SETTINGS_CHAT)
         
         result = runner.invoke(app, ["chat"])
         
-        # Verify interactive prompts were triggered
-        assert mock_prompt.call_count >= 1
+        # One turn ran, then the interrupt exited through the chat loop's handler
+        assert mock_prompt.call_count == 2
+        mock_agent.iter.assert_called_once()
+        assert result.exit_code == 1
+        assert "Interrupted by user" in result.output
 
-    @patch('troop.config.Settings.load')
-    @patch('troop.runner.Agent')
-    @patch('troop.utils.get_servers')
-    async def test_run_agent_with_streaming(self, mock_get_servers, mock_agent_class, mock_load, runner):
+    def test_run_agent_with_streaming(self, runner, agent_iter_mocks, monkeypatch, use_settings):
         """Test agent execution with streaming responses."""
-        settings = Settings(
-            api_keys={"openai": "sk-test"},
-            agents={
-                "stream-test": {
-                    "instructions": "Test streaming",
-                    "model": "gpt-4",
-                    "mcp_servers": []
-                }
-            }
-        )
-        mock_load.return_value = settings
-        
-        # Mock Agent.iter context manager (no events required for this light check)
-        mock_agent = MagicMock()
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__.return_value = mock_ctx
-        mock_ctx.__aexit__.return_value = None
-        async def _empty():
-            if False:
-                yield None
-        mock_ctx.__aiter__.return_value = _empty()
-        mock_ctx.result = MagicMock()
-        mock_agent.iter.return_value = mock_ctx
-        mock_agent_class.return_value = mock_agent
-        
-        from troop.app import app
+        mock_agent_class, mock_agent, _ = agent_iter_mocks
+        servers = []
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: servers)
+        
+        use_settings(_SETTINGS_STREAM)
         
         result = runner.invoke(app, ["stream-test", "-p", "Test streaming"])
         
@@ -250,55 +219,28 @@ class TestAgentExecution:
         # Check the iter-based run happened
         mock_agent.iter.assert_called_once()
 
-    @patch('troop.config.Settings.load')
-    @patch('troop.app.typer.prompt')
-    def test_main_keyboard_interrupt(self, mock_prompt, mock_load, runner, mock_settings_with_agent):
+    def test_main_keyboard_interrupt(self, mock_settings_with_agent, monkeypatch, use_settings):
         """Test handling KeyboardInterrupt in interactive mode."""
-        mock_load.return_value = mock_settings_with_agent
-        
         # Simulate KeyboardInterrupt
-        mock_prompt.side_effect = KeyboardInterrupt()
-        
-        from troop.app import app
+        monkeypatch.setattr(typer, "prompt", MagicMock(side_effect=KeyboardInterrupt()))
         
-        result = runner.invoke(app, ["test-agent"])  # exit code may vary but should not crash
+        use_settings(mock_settings_with_agent)
         
-        # Should exit gracefully with error code
-        assert result.exit_code in (0, 1, 2)
+        # Should exit gracefully with an exit code rather than crash
+        with pytest.raises(typer.Exit):
+            interactive_loop("test-agent")
 
-    @patch('troop.config.Settings.load')
-    @patch('troop.runner.Agent')
-    @patch('troop.utils.get_servers')
-    async def test_run_agent_with_tool_errors(self, mock_get_servers, mock_agent_class, mock_load, runner):
+    def test_run_agent_with_tool_errors(self, runner, monkeypatch, use_settings):
         """Test agent execution when tools throw errors."""
-        settings = Settings(
-            api_keys={"openai": "sk-test"},
-            agents={
-                "error-test": {
-                    "instructions": "Test error handling",
-                    "model": "gpt-4",
-                    "mcp_servers": ["error-server"]
-                }
-            },
-            mcp_servers={
-                "error-server": {
-                    "command": ["error"],
-                    "env": {}
-                }
-            }
-        )
-        mock_load.return_value = settings
         
-        mock_get_servers.return_value = []
+        servers = []
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: servers)
         
-        # Mock Agent.iter raising on enter
-        mock_agent = MagicMock()
-        mock_ctx = AsyncMock()
-        mock_ctx.__aenter__.side_effect = Exception("Server failed to start")
-        mock_agent.iter.return_value = mock_ctx
-        mock_agent_class.return_value = mock_agent
+        # Agent.iter raises on enter
+        ctx = _FakeAgentCtx(enter_exc=Exception("Server failed to start"))
+        monkeypatch.setattr(troop.runner, "Agent", MagicMock(return_value=_FakeAgent(ctx)))
         
-        from troop.app import app
+        use_settings(_SETTINGS_ERROR)
         
         result = runner.invoke(app, ["error-test", "-p", "Test"])
         
@@ -306,28 +248,10 @@ class TestAgentExecution:
         assert result.exit_code == 1
         assert "Failed to connect to MCP server" in result.stdout
 
-    @patch('troop.config.Settings.load')
-    def test_dynamic_command_creation(self, mock_load, runner):
+    def test_dynamic_command_creation(self, runner, use_settings):
         """Test that agent commands are dynamically created."""
-        settings = Settings(
-            api_keys={"openai": "sk-test"},
-            agents={
-                "dynamic1": {
-                    "instructions": "First dynamic agent",
-                    "model": "gpt-4",
-                    "mcp_servers": []
-                },
-                "dynamic2": {
-                    "instructions": "Second dynamic agent",
-                    "model": "gpt-4",
-                    "mcp_servers": []
-                }
-            }
-        )
-        mock_load.return_value = settings
         
-        # Import app after settings are mocked
-        from troop.app import app
+        use_settings(_SETTINGS_DYNAMIC)
         
         # Check help to see if commands were created
         result = runner.invoke(app, ["--help"])
@@ -335,3 +259,147 @@ class TestAgentExecution:
         assert result.exit_code == 0
         assert "dynamic1" in result.stdout
         assert "dynamic2" in result.stdout
+
+
+class TestAgentExecutionSimple:
+    """Simplified integration tests that test core functionality."""
+    
+    def test_help_shows_static_commands(self, runner):
+        """Test that help command shows the static commands."""
+        result = runner.invoke(app, ["--help"])
+        
+        assert result.exit_code == 0
+        assert "provider" in result.stdout
+        assert "mcp" in result.stdout
+        assert "agent" in result.stdout
+    
+    def test_provider_list_command(self, runner, use_settings):
+        """Test that provider list command works."""
+        use_settings(Settings(providers={"openai": "sk-test"}))
+        
+        result = runner.invoke(app, ["provider", "list"])
+        
+        assert result.exit_code == 0
+        assert "openai" in result.stdout
+    
+    def test_mcp_list_command(self, runner, use_settings):
+        """Test that mcp list command works."""
+        use_settings(Settings(mcps={"test-server": {"command": ["echo", "test"], "env": {}}}))
+
+        result = runner.invoke(app, ["mcp", "list"])
+
+        assert result.exit_code == 0
+        assert "test-server" in result.stdout
+
+    def test_agent_list_command(self, runner, use_settings):
+        """Test that agent list command works."""
+        use_settings(Settings(agents={
+            "test-agent": {"instructions": "Test agent", "model": "gpt-4", "servers": []}
+        }))
+
+        result = runner.invoke(app, ["agent", "list"])
+
+        assert result.exit_code == 0
+        assert "test-agent" in result.stdout
+
+    def test_rebuild_updates_config_and_agent_commands(self, runner, use_settings):
+        """Test rebuild() rebinds the settings every command module reads."""
+        use_settings(_SETTINGS_DYNAMIC)
+
+        assert troop.config.settings is troop.commands.agent.settings
+        assert troop.commands.mcp.settings is troop.commands.agent.settings
+        # `troop agent list` and the top-level agent commands agree
+        listed = runner.invoke(app, ["agent", "list"]).stdout
+        registered = runner.invoke(app, ["--help"]).stdout
+        for name in ("dynamic1", "dynamic2"):
+            assert name in listed
+            assert name in registered
+
+    def test_agent_execution_flow(self, agent_iter_mocks, monkeypatch, use_settings, capsys):
+        """Test the basic flow of agent execution."""
+        mock_agent_class, mock_agent, _ = agent_iter_mocks
+        servers = []
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: servers)
+        
+        # Test the create_agent_command function directly
+        test_command = create_agent_command("test-agent")
+        
+        # Settings for this agent
+        use_settings(Settings(
+            agents={
+                "test-agent": {
+                    "instructions": "Test instructions",
+                    "model": "gpt-4",
+                    "servers": []
+                }
+            },
+            providers={"openai": "sk-test"},
+        ))
+        
+        # Test with prompt; the command function is called without click parsing
+        test_command(prompt="Test prompt", model=None, verbose=False)
+        
+        assert "Error" not in capsys.readouterr().out
+        mock_agent_class.assert_called_once()
+        _, kwargs = mock_agent_class.call_args
+        actual_model = kwargs.get("model")
+        if isinstance(actual_model, str):
+            assert actual_model == "gpt-4"
+        else:
+            assert getattr(actual_model, "system", None) == "openai"
+            name = getattr(actual_model, "model_name", "")
+            assert name in _GPT4_NAMES or name.startswith("gpt-4")
+        assert kwargs.get("instructions") == "Test instructions"
+        assert kwargs.get("toolsets") == servers
+        mock_agent.iter.assert_called_once()
+    
+    def test_create_agent_command_is_cached(self):
+        """Test that repeated lookups reuse the same command function."""
+        assert create_agent_command("test-agent") is create_agent_command("test-agent")
+        assert create_agent_command("test-agent") is not create_agent_command("other-agent")
+    
+    def test_error_handling_no_model(self, capsys, use_settings):
+        """Test error handling when no model is specified."""
+        test_command = create_agent_command("test-agent")
+        
+        use_settings(Settings(
+            agents={
+                "test-agent": {
+                    "instructions": "Test",
+                    "servers": []
+                    # No model specified
+                }
+            }
+        ))
+        
+        # Reports the error and returns normally rather than exiting non-zero
+        assert test_command(prompt="Test", model=None, verbose=False) is None
+        
+        assert "No model specified" in capsys.readouterr().out
+    
+    def test_mcp_server_error_handling(self, monkeypatch, use_settings, capsys):
+        """Test error handling when MCP server fails."""
+        # Mock agent that raises error on context enter
+        mock_agent = AsyncMock()
+        mock_agent.__aenter__.side_effect = Exception("MCP server failed")
+        monkeypatch.setattr(troop.runner, "Agent", MagicMock(return_value=mock_agent))
+        
+        test_command = create_agent_command("test-agent")
+        
+        use_settings(Settings(
+            agents={
+                "test-agent": {
+                    "instructions": "Test",
+                    "model": "gpt-4",
+                    "servers": ["failing-server"]
+                }
+            },
+            providers={"openai": "sk-test"},
+        ))
+        monkeypatch.setattr(troop.runner, "get_servers", lambda *args: [])
+        
+        with pytest.raises(typer.Exit) as exc_info:
+            test_command(prompt="Test", model=None, verbose=False)
+        
+        assert exc_info.value.exit_code == 1
+        assert "Failed to connect to MCP server" in capsys.readouterr().out
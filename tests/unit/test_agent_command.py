@@ -10,6 +10,13 @@ class TestAgentCommand:
     def runner(self):
         return CliRunner()
 
+    def test_registered_commands(self):
+        """Test the agent group exposes exactly one handler per subcommand."""
+        from troop.commands import agent_app
+
+        names = [cmd.name for cmd in agent_app.registered_commands]
+        assert sorted(names) == ["add", "edit", "list", "remove", "set"]
+
     @pytest.fixture
     def mock_settings(self):
         """Create a mock settings object with agents and MCP servers."""
@@ -268,3 +275,82 @@ class TestAgentCommand:
         assert result.exit_code == 0
         agent = mock_settings.agents["simple-agent"]
         assert agent["servers"] == []
+
+    @patch('troop.commands.agent.settings')
+    @patch('troop.editor.click.edit')
+    def test_add_agent_editor(self, mock_edit, mock_settings, runner):
+        """Test adding an agent through a single $EDITOR pass."""
+        mock_settings.agents = {}
+        mock_settings.mcps = {"web-tools": {"command": ["uvx", "mcp-web-tools"], "env": {}}}
+        mock_settings.save = MagicMock()
+
+        mock_edit.side_effect = [
+            'model = "openai:gpt-4"\ninstructions = "Hi"\nservers = ["missing"]\n',
+            'model = "openai:gpt-4"\ninstructions = "Hi"\nservers = ["web-tools"]\n',
+        ]
+
+        result = runner.invoke(app, ["add", "editor-agent", "--editor"])
+
+        assert result.exit_code == 0
+        # Validation errors re-open the editor with the error as a comment
+        assert mock_edit.call_count == 2
+        assert mock_edit.call_args_list[1].args[0].startswith("# Error:")
+        assert mock_settings.agents["editor-agent"] == {
+            "model": "openai:gpt-4",
+            "instructions": "Hi",
+            "servers": ["web-tools"],
+        }
+        mock_settings.save.assert_called_once()
+
+    @patch('troop.commands.agent.settings')
+    @patch('troop.editor.click.edit')
+    def test_add_agent_editor_rejects_empty_or_bare_model(self, mock_edit, mock_settings, runner):
+        """Test an empty model and a model without a provider re-open the editor."""
+        mock_settings.agents = {}
+        mock_settings.mcps = {}
+        mock_settings.models = {"fast": {"model": "openai:gpt-4o-mini", "settings": {}}}
+        mock_settings.save = MagicMock()
+
+        mock_edit.side_effect = [
+            'model = ""\ninstructions = "Hi"\n',
+            'model = "gpt-4"\ninstructions = "Hi"\n',
+            'model = "fast"\ninstructions = "Hi"\n',
+        ]
+
+        result = runner.invoke(app, ["add", "editor-agent", "--editor"])
+
+        assert result.exit_code == 0
+        assert mock_edit.call_count == 3
+        assert "must not be empty" in mock_edit.call_args_list[1].args[0]
+        assert "provider:model" in mock_edit.call_args_list[2].args[0]
+        assert mock_settings.agents["editor-agent"]["model"] == "fast"
+        mock_settings.save.assert_called_once()
+
+    @patch('troop.commands.agent.settings')
+    @patch('troop.editor.click.edit')
+    def test_edit_agent_editor_abort(self, mock_edit, mock_settings, runner):
+        """Test closing the editor without saving leaves the agent unchanged."""
+        mock_settings.agents = {"coder": {"model": "gpt-4", "instructions": "test", "servers": []}}
+        mock_settings.save = MagicMock()
+        mock_edit.return_value = None
+
+        result = runner.invoke(app, ["edit", "coder", "--editor"])
+
+        assert result.exit_code == 0
+        assert "Aborted" in result.stdout
+        assert mock_settings.agents["coder"]["model"] == "gpt-4"
+        mock_settings.save.assert_not_called()
+
+    @patch('troop.commands.agent.settings')
+    @patch('troop.editor.click.edit')
+    def test_edit_agent_editor_comments_out_none(self, mock_edit, mock_settings, runner):
+        """Test unset (None) fields are commented out rather than written as "None"."""
+        mock_settings.agents = {"coder": {"model": None, "instructions": "test", "servers": []}}
+        mock_settings.save = MagicMock()
+        mock_edit.return_value = None
+
+        runner.invoke(app, ["edit", "coder", "--editor"])
+
+        template = mock_edit.call_args.args[0]
+        assert "# model =\n" in template
+        assert "None" not in template
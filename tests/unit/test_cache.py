@@ -0,0 +1,63 @@
+from unittest.mock import AsyncMock, patch
+
+from troop.cache import PromptCache, ToolCache
+
+
+class TestPromptCache:
+    def test_put_and_get(self, temp_config_dir):
+        """Test a stored response is returned for the same key."""
+        cache = PromptCache(ttl=60, path=temp_config_dir / "cache.sqlite")
+        key = PromptCache.make_key("openai\0gpt-4o", "Hello")
+        assert cache.get(key) is None
+
+        cache.put(key, "Hi there!")
+        assert cache.get(key) == "Hi there!"
+        cache.close()
+
+    def test_keys_differ_by_scope(self):
+        """Test the same prompt under different agents yields different keys."""
+        assert PromptCache.make_key("a", "Hello") != PromptCache.make_key("b", "Hello")
+
+    def test_expired_entries_are_ignored(self, temp_config_dir):
+        """Test entries older than the TTL are treated as misses."""
+        cache = PromptCache(ttl=10, path=temp_config_dir / "cache.sqlite")
+        with patch('troop.cache.time.time', return_value=1000.0):
+            cache.put("k", "old")
+        with patch('troop.cache.time.time', return_value=1011.0):
+            assert cache.get("k") is None
+        cache.close()
+
+
+class TestToolCache:
+    def test_keys_ignore_argument_order(self):
+        """Test equal arguments produce the same key regardless of order."""
+        assert ToolCache.make_key("search", {"q": "x", "n": 3}) == ToolCache.make_key(
+            "search", {"n": 3, "q": "x"}
+        )
+        assert ToolCache.make_key("search", {"q": "x"}) != ToolCache.make_key("fetch", {"q": "x"})
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries past their TTL return the default."""
+        cache = ToolCache(ttl=10)
+        with patch('troop.cache.time.monotonic', return_value=100.0):
+            cache.put("k", ["result"])
+        with patch('troop.cache.time.monotonic', return_value=105.0):
+            assert cache.get("k") == ["result"]
+        with patch('troop.cache.time.monotonic', return_value=110.0):
+            assert cache.get("k", "miss") == "miss"
+
+    async def test_mcp_server_reuses_identical_calls(self):
+        """Test a caching MCP server hits the subprocess once per distinct call."""
+        from pydantic_ai.mcp import MCPServerStdio
+        from troop.utils import QuietMCPServer
+
+        server = QuietMCPServer(command="echo", args=[])
+        server.tool_cache = ToolCache(ttl=60)
+        with patch.object(
+            MCPServerStdio, "direct_call_tool", AsyncMock(return_value="42")
+        ) as mock_call:
+            assert await server.direct_call_tool("add", {"a": 1, "b": 2}) == "42"
+            assert await server.direct_call_tool("add", {"b": 2, "a": 1}) == "42"
+            await server.direct_call_tool("add", {"a": 2, "b": 2})
+
+        assert mock_call.await_count == 2
@@ -131,11 +131,10 @@ class TestSettings:
             with pytest.raises(yaml.YAMLError):
                 settings = Settings.load()
 
-    @patch('troop.config.config_path')
-    def test_save(self, mock_config_path):
+    def test_save(self, temp_config_dir):
         """Test save() method."""
-        mock_config_path.parent.mkdir = lambda **kwargs: None
-        
+        path = temp_config_dir / "config.yaml"
+
         settings = Settings(
             providers={"openai": "sk-test"},
             mcps={
@@ -152,23 +151,39 @@ class TestSettings:
                 }
             }
         )
-        
-        mock_file = mock_open()
-        with patch('builtins.open', mock_file):
+
+        with patch('troop.config.config_path', path):
             settings.save()
-        
-        # Verify file was opened for writing
-        mock_file.assert_called_once_with(mock_config_path, 'w')
-        
-        # Verify content was written
-        handle = mock_file()
-        written_data = ''.join(call.args[0] for call in handle.write.call_args_list)
-        saved_data = yaml.safe_load(written_data)
-        
+
+        # Verify the file was swapped in atomically without leftovers
+        assert list(temp_config_dir.iterdir()) == [path]
+        assert path.stat().st_mode & 0o777 == 0o600
+        saved_data = yaml.safe_load(path.read_text())
+
         assert saved_data["providers"]["openai"] == "sk-test"
         assert saved_data["mcps"]["web-tools"]["command"] == ["uvx", "mcp-web-tools"]
         assert saved_data["agents"]["researcher"]["instructions"] == "Test instructions"
 
+    def test_save_keeps_file_mode(self, temp_config_dir):
+        """Test save() keeps the permissions of an existing config file."""
+        path = temp_config_dir / "config.yaml"
+        path.write_text("providers: {}\n")
+        path.chmod(0o640)
+
+        with patch('troop.config.config_path', path):
+            Settings(providers={"openai": "sk-test"}).save()
+
+        assert path.stat().st_mode & 0o777 == 0o640
+        assert yaml.safe_load(path.read_text())["providers"] == {"openai": "sk-test"}
+
+    async def test_asave(self, temp_config_dir):
+        """Test asave() writes the same file as save()."""
+        path = temp_config_dir / "config.yaml"
+        with patch('troop.config.config_path', path):
+            await Settings(providers={"openai": "sk-test"}).asave()
+
+        assert yaml.safe_load(path.read_text())["providers"] == {"openai": "sk-test"}
+
     @patch('troop.config.config_path')
     def test_save_creates_parent_directory(self, mock_config_path):
         """Test that save() creates parent directory if it doesn't exist."""
@@ -177,7 +192,53 @@ class TestSettings:
         settings = Settings(providers={"test": "key"})
         
         with mock_mkdir as mkdir_mock:
-            with patch('builtins.open', mock_open()):
+            with patch('builtins.open', mock_open()), patch('troop.config.os.replace'):
                 settings.save()
         
-        mkdir_mock.assert_called_once_with(parents=True, exist_ok=True)
\ No newline at end of file
+        mkdir_mock.assert_called_once_with(parents=True, exist_ok=True)
+
+    def test_save_skips_unchanged_settings(self, temp_config_dir):
+        """Test save() only rewrites the file after a change, including nested edits."""
+        path = temp_config_dir / "config.yaml"
+        path.write_text(yaml.dump({"agents": {"a": {"model": "openai:gpt-4o"}}}))
+
+        with patch('troop.config.config_path', path):
+            settings = Settings.load()
+            with patch('troop.config.os.replace') as mock_replace:
+                settings.save()
+                mock_replace.assert_not_called()
+
+            settings.agents["a"]["model"] = "openai:gpt-5"
+            settings.save()
+
+        assert yaml.safe_load(path.read_text())["agents"]["a"]["model"] == "openai:gpt-5"
+
+    def test_save_skips_identical_file(self, temp_config_dir):
+        """Test save() leaves the file untouched when its bytes would not change."""
+        path = temp_config_dir / "config.yaml"
+
+        with patch('troop.config.config_path', path):
+            Settings(providers={"openai": "sk-test"}).save()
+            with patch('troop.config.os.replace') as mock_replace:
+                Settings(providers={"openai": "sk-test"}).save()
+                mock_replace.assert_not_called()
+
+    def test_load_cached_reuses_pickle_until_config_changes(self, temp_config_dir):
+        """Test load_cached() serves the pickle and invalidates on file change."""
+        path = temp_config_dir / "config.yaml"
+        path.write_text(yaml.dump({"providers": {"openai": "sk-test"}}))
+
+        with patch('troop.config.config_path', path):
+            first = Settings.load_cached()
+            cache_file = temp_config_dir / "config.cache.pkl"
+            assert cache_file.stat().st_mode & 0o777 == 0o600
+
+            with patch.object(Settings, 'load') as mock_load:
+                cached = Settings.load_cached()
+                mock_load.assert_not_called()
+            assert cached.providers == first.providers
+
+            path.write_text(yaml.dump({"providers": {"anthropic": "ak-test"}}))
+            updated = Settings.load_cached()
+
+        assert updated.providers == {"anthropic": "ak-test"}
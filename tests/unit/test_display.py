@@ -0,0 +1,140 @@
+import asyncio
+import io
+
+import pytest
+from rich.console import Console
+
+from troop.display import MessageDisplay, _bounded_str
+
+
+class TestFormatToolParams:
+    @pytest.fixture
+    def display(self):
+        return MessageDisplay(Console(file=io.StringIO()))
+
+    def test_compact_json(self, display):
+        """Test parameters render as compact JSON."""
+        assert display.format_tool_params({"q": "mcp", "n": 3}) == '{"q":"mcp","n":3}'
+
+    def test_empty_args(self, display):
+        """Test tools without arguments get no parameter string."""
+        assert display.format_tool_params({}) == ""
+
+    def test_long_values_are_truncated(self, display):
+        """Test long parameters are cut to 50 characters."""
+        params = display.format_tool_params({"text": "x" * 10_000})
+        assert len(params) == 50
+        assert params.endswith("...")
+
+
+class TestHandleStreamingEvents:
+    async def test_renders_are_throttled(self):
+        """Test a burst of deltas is rendered a bounded number of times."""
+        from unittest.mock import patch
+        from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
+
+        async def events():
+            yield PartStartEvent(index=0, part=TextPart(content="He"))
+            for _ in range(1000):
+                yield PartDeltaEvent(index=0, delta=TextPartDelta(content_delta="y"))
+
+        display = MessageDisplay(Console(file=io.StringIO()))
+        with patch("troop.display.Live.update", autospec=True) as mock_update:
+            text = await display.handle_streaming_events(events(), "bot")
+
+        assert text == "He" + "y" * 1000
+        # Deltas arriving faster than the refresh period are coalesced into few renders
+        assert mock_update.call_count < 10
+        assert mock_update.call_args.args[1].renderable == text
+
+    async def test_ticker_renders_while_streaming(self):
+        """Test slow streams are rendered periodically by the background ticker."""
+        from unittest.mock import patch
+        from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
+
+        async def events():
+            yield PartStartEvent(index=0, part=TextPart(content=""))
+            for _ in range(30):
+                await asyncio.sleep(0.01)
+                yield PartDeltaEvent(index=0, delta=TextPartDelta(content_delta="y"))
+
+        display = MessageDisplay(Console(file=io.StringIO()))
+        with patch("troop.display.Live.update", autospec=True) as mock_update:
+            await display.handle_streaming_events(events(), "bot")
+
+        # Roughly one render per 100 ms tick plus the final one, never one per delta
+        assert 2 <= mock_update.call_count < 30
+
+    async def test_multiple_text_parts(self):
+        """Test a second text part closes the first panel before opening its own."""
+        from pydantic_ai.messages import PartStartEvent, TextPart
+
+        async def events():
+            yield PartStartEvent(index=0, part=TextPart(content="first"))
+            yield PartStartEvent(index=1, part=TextPart(content="second"))
+
+        console = Console(file=io.StringIO(), width=40)
+        text = await MessageDisplay(console).handle_streaming_events(events(), "bot")
+
+        output = console.file.getvalue()
+        assert text == "second"
+        assert "first" in output and "second" in output
+
+
+class TestBoundedStr:
+    def test_large_string_is_sliced(self):
+        """Test strings are cut to the limit."""
+        assert _bounded_str("x" * 10_000, 501) == "x" * 501
+
+    def test_containers_keep_str_format_and_stop_early(self):
+        """Test lists and dicts match str() output but render only up to the limit."""
+
+        class Exploding:
+            def __repr__(self):
+                raise AssertionError("should not be rendered")
+
+        assert _bounded_str(["a" * 10, "b" * 10, Exploding()], 20) == "['aaaaaaaaaa', 'bbbb"
+        assert _bounded_str({"q": "x" * 10_000, "z": Exploding()}, 12) == "{'q': 'xxxxx"
+        nested = {"rows": [("id", 1), ("name", "it's")]}
+        assert _bounded_str(nested, 500) == str(nested)
+
+    def test_bytes_and_other_values(self):
+        """Test bytes keep their repr and other values fall back to str()."""
+        assert _bounded_str(b"hello", 4) == "b'he"
+        assert _bounded_str(12345, 3) == "123"
+
+
+class TestPromptUserInput:
+    async def test_falls_back_to_typer_when_not_interactive(self):
+        """Test piped input uses typer.prompt and never creates a prompt_toolkit session."""
+        from unittest.mock import patch
+
+        display = MessageDisplay(Console(file=io.StringIO()))
+        with patch("typer.prompt", return_value="hello") as mock_prompt:
+            assert await display.prompt_user_input() == "hello"
+
+        mock_prompt.assert_called_once()
+        assert display._pt_session is None
+
+    async def test_prompt_session_inside_running_loop(self):
+        """Test the prompt_toolkit session reads input without starting a second event loop."""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.input import create_pipe_input
+        from prompt_toolkit.output import DummyOutput
+
+        display = MessageDisplay(Console(file=io.StringIO()))
+        with create_pipe_input() as pipe:
+            display._pt_session = PromptSession(input=pipe, output=DummyOutput())
+            pipe.send_text("hello\r")
+            assert await display.prompt_user_input() == "hello"
+
+
+class TestShowToolExecution:
+    def test_brackets_are_not_markup(self):
+        """Test tool args and results with square brackets are shown verbatim."""
+        console = Console(file=io.StringIO(), width=80)
+        MessageDisplay(console).show_tool_execution("fetch", {"ids": [1, 2]}, "[/] [bold]x")
+
+        output = console.file.getvalue()
+        assert '"ids":[1,2]' in output
+        assert "[/] [bold]x" in output
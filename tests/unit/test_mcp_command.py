@@ -60,6 +60,52 @@ class TestMCPCommand:
         assert result.exit_code == 0
         # Empty table should still be shown
 
+    @patch('troop.commands.mcp.settings')
+    def test_list_mcp_servers_replays_cached_render(self, mock_settings, temp_config_dir, capsys):
+        """Test a repeat listing on a terminal is served from the render cache."""
+        import sys
+        from troop.commands.mcp import list_servers
+
+        path = temp_config_dir / "config.yaml"
+        mock_settings.mcps = {"web-tools": {"command": ["uvx", "mcp-web-tools"], "env": {}}}
+
+        with patch('troop.commands.mcp.config_path', path), \
+                patch.object(sys.stdout, 'isatty', return_value=True):
+            list_servers()
+            first = capsys.readouterr().out
+            with patch('rich.table.Table', side_effect=AssertionError("re-rendered")):
+                list_servers()
+            assert capsys.readouterr().out == first
+
+            # A changed server list re-renders even though config.yaml is untouched
+            mock_settings.mcps = {"other": {"command": ["uvx", "other"], "env": {}}}
+            list_servers()
+
+        assert "web-tools" in first
+        assert "other" in capsys.readouterr().out
+        assert (temp_config_dir / ".mcp_list.cache").stat().st_mode & 0o777 == 0o600
+
+    @patch('troop.commands.mcp.settings')
+    def test_list_mcp_servers_rerenders_on_bad_cache_or_resize(self, mock_settings, temp_config_dir, capsys):
+        """Test a corrupt cache file or a new terminal width falls back to rendering."""
+        import os
+        import sys
+        from troop.commands.mcp import list_servers
+
+        path = temp_config_dir / "config.yaml"
+        (temp_config_dir / ".mcp_list.cache").write_bytes(b"not a pickle")
+        mock_settings.mcps = {"web-tools": {"command": ["uvx", "mcp-web-tools"], "env": {}}}
+
+        with patch('troop.commands.mcp.config_path', path), \
+                patch.object(sys.stdout, 'isatty', return_value=True):
+            with patch('shutil.get_terminal_size', return_value=os.terminal_size((80, 24))):
+                list_servers()
+            assert "web-tools" in capsys.readouterr().out
+            with patch('shutil.get_terminal_size', return_value=os.terminal_size((120, 24))), \
+                    patch('rich.table.Table', side_effect=AssertionError("re-rendered")), \
+                    pytest.raises(AssertionError, match="re-rendered"):
+                list_servers()
+
     @patch('troop.commands.mcp.settings')
     @patch('troop.commands.mcp.typer.prompt')
     def test_add_mcp_server_interactive(self, mock_prompt, mock_settings, runner):
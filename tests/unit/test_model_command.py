@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+from troop.commands.model import _is_valid_setting_key, _parse_value
+
+
+class TestParseValue:
+    @pytest.mark.parametrize("raw, expected", [
+        ("1", 1),
+        ("+1", 1),
+        ("-2.5", -2.5),
+        (".5", 0.5),
+        ("1e3", 1000.0),
+        ("true", True),
+        ("False", False),
+        ("null", None),
+        ('"text"', "text"),
+        ('{"a": 1}', {"a": 1}),
+        ("[1, 2]", [1, 2]),
+        ("  0.7  ", 0.7),
+        ("gpt-4o", "gpt-4o"),
+        ("1.2.3", "1.2.3"),
+        ("{bad", "{bad"),
+        ("", ""),
+    ])
+    def test_parse_value(self, raw, expected):
+        """Test user-entered values are coerced like JSON with friendly fallbacks."""
+        result = _parse_value(raw)
+        assert result == expected
+        assert type(result) is type(expected)
+
+    def test_parse_value_nan(self):
+        """Test JSON NaN is accepted."""
+        assert math.isnan(_parse_value("NaN"))
+
+
+class TestIsValidSettingKey:
+    @pytest.mark.parametrize(
+        "key, expected",
+        [
+            ("temperature", True),
+            ("openai_reasoning_effort", True),
+            ("Anthropic_thinking", True),
+            ("google:safety_settings", True),
+            ("openaix_y", False),
+            ("openai", False),
+            ("unknown_key", False),
+        ],
+    )
+    def test_is_valid_setting_key(self, key, expected):
+        """Test provider prefixes must be followed by a separator."""
+        assert _is_valid_setting_key(key) is expected
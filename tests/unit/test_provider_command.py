@@ -36,6 +36,16 @@ class TestProviderCommand:
         assert "sk-tes...abcdef" in result.stdout
         assert "ak-tes...defghi" in result.stdout
 
+    @patch('troop.commands.provider.settings')
+    def test_list_providers_plain_when_piped(self, mock_settings, runner):
+        """Test that list prints tab-separated lines when stdout is not a TTY."""
+        mock_settings.providers = {"openai": "sk-test123456789abcdef"}
+
+        result = runner.invoke(app, ["list"])
+
+        assert result.exit_code == 0
+        assert result.stdout == "openai\tsk-tes...abcdef\n"
+
     @patch('troop.commands.provider.settings')
     def test_list_providers_empty(self, mock_settings, runner):
         """Test listing providers when none exist."""
@@ -0,0 +1,111 @@
+import asyncio
+import sqlite3
+
+import pytest
+from io import StringIO
+from unittest.mock import patch
+from rich.console import Console
+from pydantic_ai import Agent
+from pydantic_ai.messages import ToolCallPart
+from pydantic_ai.models.test import TestModel
+
+from troop.cache import PromptCache
+from troop.display import MessageDisplay
+from troop.runner import AgentRunner
+
+
+class TestRunOnce:
+    @pytest.fixture
+    def console(self):
+        return Console(file=StringIO(), width=80)
+
+    async def test_displays_tool_calls_and_response(self, console):
+        """Test tool panels and the agent response are rendered in order."""
+        agent = Agent(TestModel(), instructions="Test")
+
+        @agent.tool_plain
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        runner = AgentRunner(agent, "bot")
+        result = await runner.run_once("hi", MessageDisplay(console), verbose=True)
+
+        output = console.file.getvalue()
+        assert result.output == '{"add":0}'
+        assert output.index("add {") < output.index("Bot")
+
+    async def test_errors_are_not_wrapped(self, console):
+        """Test errors raised during the run surface unwrapped to the caller."""
+        agent = Agent(TestModel(), instructions="Test")
+
+        @agent.tool_plain
+        def broken() -> str:
+            raise ValueError("boom")
+
+        runner = AgentRunner(agent, "bot")
+        with pytest.raises(ValueError, match="boom"):
+            await runner.run_once("hi", MessageDisplay(console), verbose=False)
+
+    async def test_tool_args_not_parsed_when_quiet(self, console):
+        """Test tool arguments are not parsed when tool output is hidden."""
+        agent = Agent(TestModel(), instructions="Test")
+
+        @agent.tool_plain
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        runner = AgentRunner(agent, "bot")
+        with patch.object(ToolCallPart, "args_as_dict") as mock_args:
+            await runner.run_once("hi", MessageDisplay(console), verbose=False)
+
+        mock_args.assert_not_called()
+        assert "add {" not in console.file.getvalue()
+
+
+class FakeServer:
+    """Async context manager that yields while starting, like an MCP subprocess."""
+
+    # Servers currently inside __aenter__, and the most seen at once
+    inflight = 0
+    max_inflight = 0
+
+    def __init__(self):
+        self.tasks = []
+
+    async def __aenter__(self):
+        self.tasks.append(asyncio.current_task())
+        cls = type(self)
+        cls.inflight += 1
+        cls.max_inflight = max(cls.max_inflight, cls.inflight)
+        await asyncio.sleep(0)
+        cls.inflight -= 1
+        return self
+
+    async def __aexit__(self, *args):
+        self.tasks.append(asyncio.current_task())
+
+
+class TestRunning:
+    async def test_servers_start_concurrently(self):
+        """Test servers start in parallel and are exited by the task that entered them."""
+        FakeServer.max_inflight = 0
+        servers = [FakeServer() for _ in range(4)]
+        runner = AgentRunner(Agent(TestModel()), "bot", servers=servers)
+
+        async with runner.running():
+            assert FakeServer.max_inflight == 4
+
+        for server in servers:
+            entered, exited = server.tasks
+            assert entered is exited
+
+    async def test_prompt_cache_closed_on_exit(self, temp_config_dir):
+        """Test the prompt cache's SQLite connection is closed when the run ends."""
+        cache = PromptCache(ttl=60, path=temp_config_dir / "cache.sqlite")
+        runner = AgentRunner(Agent(TestModel()), "bot", cache=cache)
+
+        async with runner.running():
+            assert cache.get("k") is None
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            cache.get("k")
@@ -2,7 +2,7 @@ import pytest
 import asyncio
 import os
 from unittest.mock import patch, AsyncMock, mock_open
-from troop.utils import run_async, QuietMCPServer, get_servers
+from troop.utils import run_async, QuietMCPServer, get_servers, setup_provider_env, start_servers, _devnull
 from troop.config import Settings
 
 
@@ -71,7 +71,8 @@ class TestQuietMCPServer:
             mock_stdio_client.return_value.__aenter__.return_value = (mock_read, mock_write)
             mock_stdio_client.return_value.__aexit__.return_value = None
             
-            # Mock os.devnull
+            # Mock os.devnull; the shared handle is opened on first use
+            _devnull.cache_clear()
             with patch('builtins.open', mock_open()) as mock_file:
                 async with server.client_streams() as (read_stream, write_stream):
                     # Verify devnull was opened
@@ -80,6 +81,7 @@ class TestQuietMCPServer:
                     # Verify streams are returned
                     assert read_stream == mock_read
                     assert write_stream == mock_write
+            _devnull.cache_clear()
 
 
 class TestGetServers:
@@ -188,4 +190,93 @@ class TestGetServers:
         
         assert len(servers) == 1
         assert servers[0].command == "python"
-        assert servers[0].args == ["-u", "-m", "my_module", "--flag", "value"]
\ No newline at end of file
+        assert servers[0].args == ["-u", "-m", "my_module", "--flag", "value"]
+
+    def test_get_servers_env_overrides(self):
+        """Test server env overrides are merged over one shared copy of os.environ."""
+        settings = Settings(
+            agents={"test": {"instructions": "Test", "model": "gpt-4", "servers": ["a", "b"]}},
+            mcps={
+                "a": {"command": ["uvx", "a"], "env": {"API_KEY": "test123"}},
+                "b": {"command": ["uvx", "b"], "env": {}, "cache": True},
+            },
+        )
+
+        with patch.dict(os.environ, {"HOME_MARKER": "1"}):
+            a, b = get_servers(settings, "test")
+            assert b.env == os.environ
+
+        assert a.env["API_KEY"] == "test123"
+        assert a.env["HOME_MARKER"] == "1"
+        assert a.tool_cache is None
+        assert b.tool_cache is not None
+
+    def test_get_servers_unknown_server(self):
+        """Test referencing an unconfigured server raises KeyError."""
+        settings = Settings(
+            agents={"test": {"instructions": "Test", "model": "gpt-4", "servers": ["missing"]}},
+        )
+
+        with pytest.raises(KeyError, match="missing"):
+            get_servers(settings, "test")
+
+
+class TestQuietMCPServerToolCaching:
+    async def test_toolset_tools_built_once_per_connection(self):
+        """Test tool wrappers are reused until the connection closes."""
+        from mcp.types import Tool
+
+        server = QuietMCPServer(command="echo", args=[])
+        tools = [Tool(name="add", inputSchema={"type": "object"})]
+        with patch('pydantic_ai.mcp.MCPServerStdio.list_tools', AsyncMock(return_value=tools)) as mock_list:
+            first = await server.get_tools(None)
+            second = await server.get_tools(None)
+            assert first is second
+            assert list(first) == ["add"]
+            mock_list.assert_awaited_once()
+
+            server._running_count = 1
+            await server.__aexit__(None, None, None)
+            assert await server.get_tools(None) is not first
+
+    async def test_start_servers_prefetches_tool_lists(self):
+        """Test start_servers fetches each server's tool list during startup."""
+        servers = [QuietMCPServer(command="echo", args=[]) for _ in range(2)]
+        with patch('pydantic_ai.mcp.MCPServerStdio.__aenter__', AsyncMock()), \
+                patch('pydantic_ai.mcp.MCPServerStdio.__aexit__', AsyncMock()), \
+                patch('pydantic_ai.mcp.MCPServerStdio.list_tools', AsyncMock(return_value=[])) as mock_list:
+            async with start_servers(servers):
+                assert mock_list.await_count == 2
+
+
+class TestSetupProviderEnv:
+    def test_exports_key_for_prefixed_and_bare_names(self):
+        """Test the provider's key is exported from config for both model name styles."""
+        settings = Settings(providers={"openai": "sk-test", "anthropic": "ak-test"})
+        assert setup_provider_env("openai:gpt-4", settings) == "openai"
+        assert os.environ["OPENAI_API_KEY"] == "sk-test"
+        assert setup_provider_env("claude-3-opus", settings) == "anthropic"
+        assert os.environ["ANTHROPIC_API_KEY"] == "ak-test"
+
+    def test_exports_gemini_key_for_google_provider(self):
+        """Test Gemini keys go to GOOGLE_API_KEY, the variable GoogleProvider reads first."""
+        settings = Settings(providers={"gemini": "gk-test"})
+        assert setup_provider_env("google-gla:gemini-2.5-flash", settings) == "gemini"
+        assert setup_provider_env("gemini-2.5-flash", settings) == "gemini"
+        assert os.environ["GOOGLE_API_KEY"] == "gk-test"
+
+    def test_resolves_model_profiles(self):
+        """Test a model profile name is resolved to its underlying provider."""
+        settings = Settings(
+            providers={"openai": "sk-test"},
+            models={"fast": {"model": "openai:gpt-4o-mini", "settings": {}}},
+        )
+        assert setup_provider_env("fast", settings) == "openai"
+        assert os.environ["OPENAI_API_KEY"] == "sk-test"
+
+    def test_missing_model_or_key(self):
+        """Test nothing is exported without a model name or a configured key."""
+        settings = Settings(providers={})
+        assert setup_provider_env(None, settings) is None
+        assert setup_provider_env("openai:gpt-4", settings) is None
+        assert "OPENAI_API_KEY" not in os.environ